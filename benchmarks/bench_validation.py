@@ -0,0 +1,307 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ["single", "cached", "bulk", "parallel"]
+
+
+def _peak_rss_kb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _uncached_validator(record_type):
+    """
+    Returns a validator that loads the schema and calls jsonschema.validate on
+    every record, as validate_customer did before the schema registry.
+    """
+    import jsonschema
+    from validation.codegen import GENERATED_VALIDATORS
+
+    schema_path = GENERATED_VALIDATORS[record_type][0]
+
+    def validate(record):
+        with open(schema_path, 'r') as f:
+            schema = json.load(f)
+        try:
+            jsonschema.validate(instance=record, schema=schema)
+            return True, "valid"
+        except jsonschema.exceptions.ValidationError as e:
+            return False, e.message
+
+    return validate
+
+
+def _time_calls(path, validate, limit):
+    # Per-record latency of a validation function; decoding is not timed
+    latencies = array('q')
+    invalid = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if limit is not None and len(latencies) >= limit:
+                break
+            record = json.loads(line)
+            start = time.perf_counter_ns()
+            is_valid, _ = validate(record)
+            latencies.append(time.perf_counter_ns() - start)
+            invalid += not is_valid
+    return latencies, invalid
+
+
+def _time_stream(verdicts):
+    # Time between successive verdicts of a streaming pipeline, parsing included
+    latencies = array('q')
+    invalid = 0
+    last = time.perf_counter_ns()
+    for verdict in verdicts:
+        now = time.perf_counter_ns()
+        latencies.append(now - last)
+        last = now
+        invalid += not verdict["valid"]
+    return latencies, invalid
+
+
+def _time_submitted(lines, verdicts_for):
+    # Per-record latency of the worker pool: from the moment a line is taken
+    # for a chunk (it is submitted with that chunk) to the moment its verdict
+    # comes back. Gaps between verdicts are meaningless here, since a whole
+    # chunk arrives at once after the pool has been busy with other chunks.
+    submitted = deque()
+
+    def timed_lines():
+        for item in lines:
+            submitted.append(time.perf_counter_ns())
+            yield item
+
+    latencies = array('q')
+    invalid = 0
+    for verdict in verdicts_for(timed_lines()):
+        latencies.append(time.perf_counter_ns() - submitted.popleft())
+        invalid += not verdict["valid"]
+    return latencies, invalid
+
+
+def run_mode(mode, record_type, path, workers=None, chunk_size=None, limit=None):
+    """
+    Runs one benchmark mode in the current process.
+
+    Args:
+        mode (str): "single", "cached", "bulk" or "parallel".
+        record_type (str): Either "vendor" or "customer".
+        path (str): NDJSON file of records.
+        workers (int): Worker processes for the parallel mode.
+        chunk_size (int): Records per task for the parallel mode.
+        limit (int): Maximum records for the per-call modes, or None for all.
+
+    Returns:
+        dict: Throughput, latency percentiles and peak memory for the run.
+    """
+    from validation.bulk import get_record_validator, iter_records, validate_records
+
+    start = time.perf_counter()
+    if mode == "single":
+        latencies, invalid = _time_calls(path, _uncached_validator(record_type), limit)
+    elif mode == "cached":
+        latencies, invalid = _time_calls(path, get_record_validator(record_type), limit)
+    elif mode == "bulk":
+        with open(path, 'r', encoding='utf-8') as f:
+            verdicts = validate_records(iter_records(f), get_record_validator(record_type))
+            latencies, invalid = _time_stream(verdicts)
+    elif mode == "parallel":
+        from validation.bulk import iter_ndjson_lines
+        from validation.parallel import DEFAULT_CHUNK_SIZE, validate_lines_parallel
+
+        with open(path, 'r', encoding='utf-8') as f:
+            latencies, invalid = _time_submitted(
+                iter_ndjson_lines(f),
+                lambda lines: validate_lines_parallel(
+                    lines, record_type, workers=workers, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE
+                ),
+            )
+    else:
+        raise ValueError(f"Unknown mode: {mode!r}")
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    p50 = _percentile(ordered, 0.50)
+    p99 = _percentile(ordered, 0.99)
+    result = {
+        "records": len(latencies),
+        "invalid": invalid,
+        "seconds": round(elapsed, 4),
+        "records_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": p50 / 1e6 if p50 is not None else None,
+        "p99_ms": p99 / 1e6 if p99 is not None else None,
+        "peak_rss_kb": _peak_rss_kb(resource.RUSAGE_SELF) if resource else None,
+    }
+    if mode == "parallel" and resource is not None:
+        result["peak_worker_rss_kb"] = _peak_rss_kb(resource.RUSAGE_CHILDREN)
+    return result
+
+
+def _run_mode_subprocess(mode, args, path):
+    # A fresh interpreter per mode keeps peak RSS figures independent
+    command = [
+        sys.executable, "-m", "benchmarks.bench_validation", args.record_type,
+        "--run-mode", mode, "--input", path,
+    ]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    if args.chunk_size:
+        command += ["--chunk-size", str(args.chunk_size)]
+    if mode == "single" and args.single_limit:
+        command += ["--single-limit", str(args.single_limit)]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in [REPO_ROOT, env.get("PYTHONPATH")] if p)
+    completed = subprocess.run(command, cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(completed.stdout)
+
+
+def _environment():
+    try:
+        from importlib.metadata import version
+        jsonschema_version = version("jsonschema")
+    except Exception:
+        jsonschema_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jsonschema": jsonschema_version,
+        "git_commit": commit,
+    }
+
+
+def compare_results(current, baseline, tolerance):
+    """
+    Compares throughput with a previous results file.
+
+    Args:
+        current (dict): Results from this run.
+        baseline (dict): Results loaded from an earlier run.
+        tolerance (float): Allowed throughput drop as a fraction (0.1 = 10%).
+
+    Returns:
+        list: (mode, baseline rate, current rate, regressed) for each mode in both runs.
+    """
+    rows = []
+    for mode, result in current["results"].items():
+        previous = baseline.get("results", {}).get(mode)
+        if not previous or not previous.get("records_per_second") or not result.get("records_per_second"):
+            continue
+        before = previous["records_per_second"]
+        after = result["records_per_second"]
+        rows.append((mode, before, after, after < before * (1 - tolerance)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark vendor and customer record validation.")
+    parser.add_argument("record_type", choices=["vendor", "customer"])
+    parser.add_argument("-n", "--records", type=int, default=20000, help="Synthetic records to validate")
+    parser.add_argument("--invalid-ratio", type=float, default=0.05, help="Share of invalid records (0-1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {MODES}")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Workers for the parallel mode")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Records per task for the parallel mode")
+    parser.add_argument("--single-limit", type=int, default=1000,
+                        help="Records for the slow single mode (default: 1000)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="File for the JSON results")
+    parser.add_argument("--compare", help="Earlier results file to check for throughput regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Allowed throughput drop against --compare (default: 0.1)")
+    # Internal: run one mode against an existing input file and print its result
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        limit = args.single_limit if args.run_mode == "single" else None
+        result = run_mode(args.run_mode, args.record_type, args.input, args.workers, args.chunk_size, limit)
+        print(json.dumps(result))
+        return 0
+
+    from benchmarks.synthetic import GENERATORS
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {sorted(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"{args.record_type}.ndjson")
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in GENERATORS[args.record_type](args.records, args.invalid_ratio, args.seed):
+                f.write(json.dumps(record))
+                f.write("\n")
+
+        for mode in modes:
+            results[mode] = _run_mode_subprocess(mode, args, path)
+            r = results[mode]
+            print(f"{mode:>8}: {r['records_per_second']:>10.1f} records/s  "
+                  f"p50 {r['p50_ms']:.3f} ms  p99 {r['p99_ms']:.3f} ms  peak RSS {r['peak_rss_kb']} KB")
+
+    report = {
+        "environment": _environment(),
+        "parameters": {
+            "record_type": args.record_type,
+            "records": args.records,
+            "invalid_ratio": args.invalid_ratio,
+            "seed": args.seed,
+            "workers": args.workers,
+            "chunk_size": args.chunk_size,
+            "single_limit": args.single_limit,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressed = False
+        for mode, before, after, is_regression in compare_results(report, baseline, args.tolerance):
+            regressed |= is_regression
+            flag = "REGRESSION" if is_regression else "ok"
+            print(f"{mode:>8}: {before:>10.1f} -> {after:>10.1f} records/s  {flag}")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
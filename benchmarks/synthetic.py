@@ -0,0 +1,218 @@
+import argparse
+import copy
+import json
+import random
+import string
+import sys
+
+from customer.customer_id import build_sample_customers
+from customer.validate_customer import CUSTOMER_SCHEMA_PATH
+from vendor.vendor_id import build_sample_vendors
+
+# Share of addresses in each country group
+COUNTRY_WEIGHTS = {"CA": 0.6, "US": 0.25, "other": 0.15}
+
+OTHER_COUNTRIES = ["GB", "FR", "DE", "MX", "JP", "AU"]
+
+CA_REGIONS = [
+    ("Ontario", "K"), ("Quebec", "H"), ("British Columbia", "V"), ("Alberta", "T"),
+    ("Manitoba", "R"), ("Nova Scotia", "B"), ("Saskatchewan", "S"), ("New Brunswick", "E"),
+]
+US_STATES = ["New York", "California", "Texas", "Washington", "Illinois", "Florida"]
+CITIES = ["Ottawa", "Toronto", "Vancouver", "Montreal", "Calgary", "Halifax", "Boston", "Seattle", "London"]
+STREETS = ["Main Street", "Oak Avenue", "Birch Street", "Government Road", "Partner Avenue", "King Street"]
+
+
+def _vendor_templates():
+    # The samples in vendor_id, grouped by organizationType. There is no
+    # "Other Government" sample, so one is derived from the OGD sample.
+    samples = build_sample_vendors()
+    other_government = copy.deepcopy(samples["ogd"])
+    other_government["legalName"] = "Province of Example"
+    other_government["organizationType"] = "Other Government"
+    return {
+        "Individual": [samples["individual"], samples["sole_proprietor"]],
+        "Corporation/Partnership": [samples["corporation"], samples["partnership"]],
+        "Employee": [samples["employee"]],
+        "Other Government Department": [samples["ogd"]],
+        "Other Government": [other_government],
+    }
+
+
+def _customer_templates():
+    # One template per customerType allowed by customer_schema.json
+    samples = build_sample_customers()
+    with open(CUSTOMER_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        customer_types = json.load(f)["properties"]["customerType"]["enum"]
+    templates = {}
+    for customer_type in customer_types:
+        template = copy.deepcopy(samples.get(customer_type.lower(), samples["business"]))
+        template["customerType"] = customer_type
+        templates[customer_type] = template
+    return templates
+
+
+def _address(rng):
+    """Returns (countryCode, province, postalCode) for a random address."""
+    group = rng.choices(list(COUNTRY_WEIGHTS), weights=list(COUNTRY_WEIGHTS.values()))[0]
+    if group == "CA":
+        province, first_letter = rng.choice(CA_REGIONS)
+        letters = string.ascii_uppercase
+        postal = (f"{first_letter}{rng.randint(0, 9)}{rng.choice(letters)}"
+                  f"{rng.choice(['', ' '])}{rng.randint(0, 9)}{rng.choice(letters)}{rng.randint(0, 9)}")
+        return "CA", province, postal
+    if group == "US":
+        postal = f"{rng.randint(0, 99999):05d}"
+        if rng.random() < 0.3:
+            postal += f"-{rng.randint(0, 9999):04d}"
+        return "US", rng.choice(US_STATES), postal
+    return rng.choice(OTHER_COUNTRIES), "Region", f"{rng.randint(1000, 99999)}"
+
+
+def _invalid_vendor_mutations(record):
+    ids = record["vendorIdentificationNumbers"]
+    address = record["contactInformation"]["address"]
+    return [
+        lambda: record.pop("legalName"),
+        lambda: record.update(countryCode=record["countryCode"].lower()),
+        lambda: ids.update(businessNumber="12345"),
+        lambda: record.update(organizationType="Contractor"),
+        lambda: record.update(legalName="X" * 121),
+        lambda: record["contactInformation"].update(telephone="555-1234"),
+        lambda: record.update(taxRecipientType="9"),
+        lambda: address.update(postalCode="X" * 11),
+    ]
+
+
+def _invalid_customer_mutations(record):
+    address = record["contactInformation"]["address"]
+    return [
+        lambda: record.pop("customerID"),
+        lambda: record.update(customerType="Alien"),
+        lambda: address.update(country="Canada"),
+        lambda: address.update(city="X" * 51),
+        lambda: record["contactInformation"].update(telephone="abc"),
+    ]
+
+
+def generate_vendor_records(count, invalid_ratio=0.0, seed=0):
+    """
+    Yields synthetic vendor records built from the vendor_id samples.
+
+    Records cycle through every organizationType, use CA, US and other
+    addresses, and carry distinct identifiers. A share of them is made
+    invalid with one targeted mutation each.
+
+    Args:
+        count (int): Number of records to generate.
+        invalid_ratio (float): Share of records (0-1) that should be invalid.
+        seed (int): Random seed, so runs are reproducible.
+
+    Yields:
+        dict: Vendor records.
+    """
+    rng = random.Random(seed)
+    templates = _vendor_templates()
+    organization_types = list(templates)
+
+    for i in range(count):
+        organization_type = organization_types[i % len(organization_types)]
+        record = copy.deepcopy(rng.choice(templates[organization_type]))
+        country, province, postal = _address(rng)
+
+        record["legalName"] = f"{record['legalName']} {i}"
+        record["countryCode"] = country
+        address = record["contactInformation"]["address"]
+        address.update(
+            streetAddress=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            city=rng.choice(CITIES),
+            province=province,
+            postalCode=postal,
+        )
+        record["contactInformation"]["telephone"] = f"{rng.randint(2000000000, 9999999999)}"
+
+        ids = record["vendorIdentificationNumbers"]
+        base_number = f"{100000000 + i % 900000000:09d}"
+        if "businessNumber" in ids:
+            ids["businessNumber"] = base_number
+        if "gstHstNumber" in ids:
+            ids["gstHstNumber"] = f"{base_number}RT0001"
+        if "uniqueIdentifier" in ids:
+            ids["uniqueIdentifier"] = f"ID{i:08d}"
+        ids["supplierNumber"] = f"SUPP-{i}"
+
+        if rng.random() < invalid_ratio:
+            rng.choice(_invalid_vendor_mutations(record))()
+        yield record
+
+
+def generate_customer_records(count, invalid_ratio=0.0, seed=0):
+    """
+    Yields synthetic customer records built from the customer_id samples.
+
+    Records cycle through every customerType in customer_schema.json and use
+    CA, US and other addresses. A share of them is made invalid with one
+    targeted mutation each.
+
+    Args:
+        count (int): Number of records to generate.
+        invalid_ratio (float): Share of records (0-1) that should be invalid.
+        seed (int): Random seed, so runs are reproducible.
+
+    Yields:
+        dict: Customer records.
+    """
+    rng = random.Random(seed)
+    templates = _customer_templates()
+    customer_types = list(templates)
+
+    for i in range(count):
+        record = copy.deepcopy(templates[customer_types[i % len(customer_types)]])
+        country, province, postal = _address(rng)
+
+        record["customerID"] = f"CUST{i:08d}"
+        if "legalName" in record:
+            record["legalName"] = f"{record['legalName']} {i}"
+        address = record["contactInformation"]["address"]
+        address.update(
+            streetAddress=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            city=rng.choice(CITIES),
+            province=province,
+            postalCode=postal,
+            country=country,
+        )
+        record["contactInformation"]["telephone"] = f"{rng.randint(2000000000, 9999999999)}"
+
+        if rng.random() < invalid_ratio:
+            rng.choice(_invalid_customer_mutations(record))()
+        yield record
+
+
+GENERATORS = {
+    "vendor": generate_vendor_records,
+    "customer": generate_customer_records,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic vendor or customer records as NDJSON.")
+    parser.add_argument("record_type", choices=sorted(GENERATORS))
+    parser.add_argument("count", type=int)
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: standard output)")
+    parser.add_argument("--invalid-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    try:
+        for record in GENERATORS[args.record_type](args.count, args.invalid_ratio, args.seed):
+            out.write(json.dumps(record))
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
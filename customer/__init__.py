@@ -0,0 +1,23 @@
+import importlib
+
+# Public names and the modules they live in. They are imported on first
+# access, so importing the package does not load the schema or jsonschema.
+_EXPORTS = {
+    "validate_customer": "customer.validate_customer",
+    "collect_customer_errors": "customer.validate_customer",
+    "CUSTOMER_SCHEMA_PATH": "customer.validate_customer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,247 @@
+# Generated by validation/codegen.py from customer/customer_schema/customer_schema.json.
+# Do not edit by hand; run `python -m validation.codegen` after changing the schema.
+import re
+
+SCHEMA_SHA256 = '2bcbd737fdd49ede1b1621f0a0f332f4c86e9d8e27cd9074f59db77137bf457e'
+
+_MISSING = object()
+_OTHER = object()
+
+
+def _token(value, literals):
+    # Reduces a discriminator value to a dispatch table key
+    if value is _MISSING:
+        return _MISSING
+    if isinstance(value, str) and value in literals:
+        return value
+    return _OTHER
+
+
+SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema#',
+    'title': 'Customer Record Structure',
+    'description': "Data elements based on Treasury Board of Canada's Standard on Customer Record",
+    'type': 'object',
+    'required': ['customerID', 'customerType'],
+    'properties': {
+        'customerID': {
+            'description': 'Unique identifier for the customer',
+            'type': 'string',
+        },
+        'customerType': {
+            'description': 'Type of customer',
+            'type': 'string',
+            'enum': ['Individual', 'Business', 'Organization', 'Government'],
+        },
+        'contactInformation': {
+            'type': 'object',
+            'properties': {
+                'address': {
+                    'type': 'object',
+                    'properties': {
+                        'streetAddress': {
+                            'type': 'string',
+                            'maxLength': 100,
+                        },
+                        'city': {
+                            'type': 'string',
+                            'maxLength': 50,
+                        },
+                        'province': {
+                            'type': 'string',
+                            'maxLength': 50,
+                        },
+                        'postalCode': {
+                            'type': 'string',
+                            'maxLength': 10,
+                        },
+                        'country': {
+                            'type': 'string',
+                            'pattern': '^[A-Z]{2}$',
+                        },
+                    },
+                    'required': ['streetAddress', 'city', 'country'],
+                },
+                'telephone': {
+                    'type': 'string',
+                    'pattern': '^[0-9]{10,15}$',
+                },
+                'email': {
+                    'type': 'string',
+                    'format': 'email',
+                },
+            },
+        },
+    },
+}
+
+
+_ENUM1 = frozenset(['Business', 'Government', 'Individual', 'Organization'])
+_PATTERN6 = re.compile('^[A-Z]{2}$').search
+_PATTERN9 = re.compile('^[0-9]{10,15}$').search
+
+
+def _v0(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    return None
+
+
+def _v2(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if not (instance in _ENUM1):
+        return repr(instance) + " is not one of ['Individual', 'Business', 'Organization', 'Government']"
+    return None
+
+
+def _v3(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if len(instance) > 100:
+        return repr(instance) + ' is too long'
+    return None
+
+
+def _v4(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if len(instance) > 50:
+        return repr(instance) + ' is too long'
+    return None
+
+
+def _v5(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if len(instance) > 10:
+        return repr(instance) + ' is too long'
+    return None
+
+
+def _v7(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if _PATTERN6(instance) is None:
+        return repr(instance) + " does not match '^[A-Z]{2}$'"
+    return None
+
+
+def _v8(instance):
+    if not (isinstance(instance, dict)):
+        return repr(instance) + " is not of type 'object'"
+    if 'streetAddress' not in instance:
+        return "'streetAddress' is a required property"
+    if 'city' not in instance:
+        return "'city' is a required property"
+    if 'country' not in instance:
+        return "'country' is a required property"
+    value = instance.get('streetAddress', _MISSING)
+    if value is not _MISSING:
+        error = _v3(value)
+        if error is not None:
+            return error
+    value = instance.get('city', _MISSING)
+    if value is not _MISSING:
+        error = _v4(value)
+        if error is not None:
+            return error
+    value = instance.get('province', _MISSING)
+    if value is not _MISSING:
+        error = _v4(value)
+        if error is not None:
+            return error
+    value = instance.get('postalCode', _MISSING)
+    if value is not _MISSING:
+        error = _v5(value)
+        if error is not None:
+            return error
+    value = instance.get('country', _MISSING)
+    if value is not _MISSING:
+        error = _v7(value)
+        if error is not None:
+            return error
+    return None
+
+
+def _v10(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    if _PATTERN9(instance) is None:
+        return repr(instance) + " does not match '^[0-9]{10,15}$'"
+    return None
+
+
+def _v11(instance):
+    if not (isinstance(instance, str)):
+        return repr(instance) + " is not of type 'string'"
+    return None
+
+
+def _v12(instance):
+    if not (isinstance(instance, dict)):
+        return repr(instance) + " is not of type 'object'"
+    value = instance.get('address', _MISSING)
+    if value is not _MISSING:
+        error = _v8(value)
+        if error is not None:
+            return error
+    value = instance.get('telephone', _MISSING)
+    if value is not _MISSING:
+        error = _v10(value)
+        if error is not None:
+            return error
+    value = instance.get('email', _MISSING)
+    if value is not _MISSING:
+        error = _v11(value)
+        if error is not None:
+            return error
+    return None
+
+
+def _v13(instance):
+    if not (isinstance(instance, dict)):
+        return repr(instance) + " is not of type 'object'"
+    if 'customerID' not in instance:
+        return "'customerID' is a required property"
+    if 'customerType' not in instance:
+        return "'customerType' is a required property"
+    value = instance.get('customerID', _MISSING)
+    if value is not _MISSING:
+        error = _v0(value)
+        if error is not None:
+            return error
+    value = instance.get('customerType', _MISSING)
+    if value is not _MISSING:
+        error = _v2(value)
+        if error is not None:
+            return error
+    value = instance.get('contactInformation', _MISSING)
+    if value is not _MISSING:
+        error = _v12(value)
+        if error is not None:
+            return error
+    return None
+
+
+# Top-level rules as (name, property path, check, selector), timed by
+# validation.metrics.RuleProfiler. A check with a selector only runs when
+# selector(instance) returns it.
+RULES = (
+    ('properties/customerID', ('customerID',), _v0, None),
+    ('properties/customerType', ('customerType',), _v2, None),
+    ('properties/contactInformation', ('contactInformation',), _v12, None),
+)
+
+
+def first_error(instance):
+    """
+    Returns the message for the first schema violation found, or None if the
+    instance is valid.
+    """
+    return _v13(instance)
+
+
+def is_valid(instance):
+    """Returns True if the instance is valid against the schema."""
+    return _v13(instance) is None
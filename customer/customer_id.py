@@ -149,10 +149,12 @@ def generate_customer_schema():
     
     print(f"Customer schema written to {schema_path}")
     
-def generate_sample_customer():
+def build_sample_customers():
     """
-    Generates sample customer records that comply with the schema.
-    Creates samples for different customer types based on the Treasury Board standard.
+    Builds sample customer records that comply with the schema.
+    
+    Returns:
+        dict: Sample records keyed by name ("individual", "business", "government").
     """
     # Individual customer example
     individual_customer = {
@@ -241,21 +243,34 @@ def generate_sample_customer():
         "accountStatus": "Active"
     }
     
+    return {
+        "individual": individual_customer,
+        "business": business_customer,
+        "government": government_customer
+    }
+
+def generate_sample_customer():
+    """
+    Generates sample customer records that comply with the schema.
+    Creates samples for different customer types based on the Treasury Board standard.
+    """
+    samples = build_sample_customers()
+    
     # Save the sample files
     schema_dir = os.path.join(os.path.dirname(__file__), "customer_schema")
     os.makedirs(schema_dir, exist_ok=True)
     
     # Save individual customer
     with open(os.path.join(schema_dir, "sample_customer.json"), 'w', encoding='utf-8') as f:
-        json.dump(individual_customer, f, indent=2)
+        json.dump(samples["individual"], f, indent=2)
     
     # Save business customer
     with open(os.path.join(schema_dir, "sample_business_customer.json"), 'w', encoding='utf-8') as f:
-        json.dump(business_customer, f, indent=2)
+        json.dump(samples["business"], f, indent=2)
     
     # Save government customer
     with open(os.path.join(schema_dir, "sample_government_customer.json"), 'w', encoding='utf-8') as f:
-        json.dump(government_customer, f, indent=2)
+        json.dump(samples["government"], f, indent=2)
     
     print(f"Sample customer records written to {schema_dir}")
 
@@ -1,18 +1,37 @@
 import json
 import os
 
+from validation.errors import collect_errors
+from validation.registry import get_compiled_schema, jsonschema_installed
+
 try:
-    import jsonschema
+    from customer import customer_fast_validator
 except ImportError:
+    customer_fast_validator = None
+
+# jsonschema itself is imported by the registry on first use
+JSONSCHEMA_INSTALLED = jsonschema_installed()
+if not JSONSCHEMA_INSTALLED:
     print("Error: The jsonschema package is not installed.")
     print("Please install it using: pip install jsonschema")
     # You can either exit or provide fallback functionality
-    jsonschema = None
+
+CUSTOMER_SCHEMA_PATH = os.path.join(
+    os.path.dirname(__file__), 
+    "customer_schema", 
+    "customer_schema.json"
+)
 
 def validate_customer(customer_data):
     """
     Validates a customer record against the Customer Records schema.
     
+    The schema is compiled once per process and reloaded only when
+    customer_schema.json changes on disk. Records are checked first by the
+    generated customer_fast_validator module; jsonschema is only used to
+    report the error for invalid records, or when the generated module is
+    missing or out of date.
+    
     Args:
         customer_data (dict): A dictionary containing customer data.
         
@@ -20,31 +39,40 @@ def validate_customer(customer_data):
         tuple: (bool, str) - A boolean indicating if the record is valid, 
                and a message providing details on validation result.
     """
-    # Check if jsonschema was successfully imported
-    if jsonschema is None:
+    # Check if jsonschema is available
+    if not JSONSCHEMA_INSTALLED:
         return False, "Cannot validate: jsonschema package is not installed. Run 'pip install jsonschema' first."
     
-    schema_path = os.path.join(
-        os.path.dirname(__file__), 
-        "customer_schema", 
-        "customer_schema.json"
-    )
-    
     try:
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
+        compiled = get_compiled_schema(CUSTOMER_SCHEMA_PATH, customer_fast_validator)
     except FileNotFoundError:
-        return False, f"Schema file not found at {schema_path}"
+        return False, f"Schema file not found at {CUSTOMER_SCHEMA_PATH}"
     except json.JSONDecodeError:
         return False, "Invalid JSON in schema file"
+    except Exception as e:
+        return False, f"An error occurred during validation: {str(e)}"
     
     try:
-        jsonschema.validate(instance=customer_data, schema=schema)
-        return True, "Customer record is valid."
-    except jsonschema.exceptions.ValidationError as e:
-        return False, f"Validation error: {e.message}"
+        error = compiled.best_error(customer_data)
     except Exception as e:
         return False, f"An error occurred during validation: {str(e)}"
+    if error is not None:
+        return False, f"Validation error: {error.message}"
+    return True, "Customer record is valid."
+
+def collect_customer_errors(customer_data):
+    """
+    Collects every schema error in a customer record in a single pass.
+    
+    Args:
+        customer_data (dict): A dictionary containing customer data.
+        
+    Returns:
+        list: One dict per error with the JSON pointer of the failing value,
+              the failing keyword, the message and the schema path.
+              Empty if the record is valid.
+    """
+    return collect_errors(get_compiled_schema(CUSTOMER_SCHEMA_PATH, customer_fast_validator), customer_data)
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,82 @@
+import copy
+import glob
+import json
+import os
+import random
+
+from benchmarks.synthetic import GENERATORS
+from validation.codegen import REPO_ROOT
+
+# Values swapped into records: other JSON types, enum values and identifiers
+# of the schemas, and strings close to their patterns
+REPLACEMENTS = [
+    None, 0, 1, 1.5, True, False, "", " ", "x" * 200, [], {}, ["x"], {"x": 1},
+    "CA", "US", "ca", "GB", "Individual", "Corporation/Partnership", "Employee",
+    "Other Government", "Other Government Department", "Contractor",
+    "Business", "Government", "Small", "Medium", "Large", "1", "3", "4", "9",
+    "123456789", "12345678", "123456789RT0001", "123456789RC0001", "1234567890TQ0001",
+    "K1A 0B1", "K1A0B1", "k1a 0b1", "12345", "12345-6789", "1234", "12345678",
+    "6135550100", "555-1234", "123\n",
+]
+
+
+def _paths(value, path=()):
+    # Every location in a record, as a tuple of keys and indexes
+    yield path
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _paths(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _paths(item, path + (index,))
+
+
+def mutate(record, rng):
+    """Applies one random change to a record in place: delete, replace or edit a value."""
+    path = rng.choice([p for p in _paths(record) if p])
+    parent = record
+    for key in path[:-1]:
+        parent = parent[key]
+    key = path[-1]
+    value = parent[key]
+    choice = rng.random()
+    if choice < 0.25 and isinstance(parent, dict):
+        del parent[key]
+    elif choice < 0.4 and isinstance(value, str) and value:
+        index = rng.randrange(len(value))
+        parent[key] = value[:index] + rng.choice(["", "a", "A", "0", " ", "-"]) + value[index + 1:]
+    elif choice < 0.5 and isinstance(value, str):
+        parent[key] = value.lower() if rng.random() < 0.5 else value + value
+    elif choice < 0.55 and isinstance(value, list):
+        value.append(rng.choice(REPLACEMENTS))
+    elif choice < 0.6 and isinstance(value, dict):
+        value[rng.choice(["extra", "businessNumber", "sinNumber", "uniqueIdentifier"])] = rng.choice(REPLACEMENTS)
+    else:
+        parent[key] = copy.deepcopy(rng.choice(REPLACEMENTS))
+
+
+def sample_records(record_type):
+    """Returns the sample records shipped with the schema."""
+    directory = os.path.join(REPO_ROOT, record_type, f"{record_type}_schema")
+    records = []
+    for path in sorted(glob.glob(os.path.join(directory, "sample_*.json"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            records.append(json.load(f))
+    return records
+
+
+def fuzz_records(record_type, count, seed=0):
+    """
+    Returns the samples, synthetic records and the same records with one to
+    three random mutations each.
+    """
+    rng = random.Random(seed)
+    records = sample_records(record_type) + list(GENERATORS[record_type](count, invalid_ratio=0.2, seed=seed))
+    mutated = []
+    for record in records:
+        for _ in range(4):
+            variant = copy.deepcopy(record)
+            for _ in range(rng.randint(1, 3)):
+                mutate(variant, rng)
+            mutated.append(variant)
+    return records + mutated
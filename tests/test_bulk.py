@@ -0,0 +1,108 @@
+import io
+import json
+
+import pytest
+
+from validation.bulk import get_record_validator, iter_json_array, iter_ndjson, iter_records, main
+
+# Elements chosen so chunk boundaries fall inside strings, escapes, numbers
+# and literals
+ELEMENTS = [
+    {"a": "xé\"y\\", "b": [1, -2.5e-3, 1E+10, True, False, None], "c": {"d": "☃\n\t"}},
+    12345,
+    -0.5e10,
+    "\\u0041 😀",
+    [],
+    {},
+    None,
+    True,
+    [[[]], {"": ""}],
+    0,
+]
+
+
+class CountingStream(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def test_json_array_chunk_boundaries():
+    text = "[ " + " ,\n".join(json.dumps(e) for e in ELEMENTS) + " ]  \n"
+    for chunk_size in range(1, len(text) + 2):
+        items = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+        assert [item.record for item in items] == ELEMENTS, chunk_size
+        assert [text[item.position] for item in items] == [json.dumps(e)[0] for e in ELEMENTS]
+
+
+def test_json_array_first_chunk_and_offsets():
+    text = '  [{"a": 1}, {"b": 2}]'
+    stream = io.StringIO(text)
+    items = list(iter_records(stream, "auto", chunk_size=3))
+    assert [(item.position, item.record) for item in items] == [(3, {"a": 1}), (13, {"b": 2})]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 20])
+@pytest.mark.parametrize("text", ["", "[", "[1,", "[1 2]", "[1,]", "[1] 2", "{}", '["abc'])
+def test_json_array_rejects_malformed_input(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+def test_json_array_stops_at_bad_element_without_reading_on():
+    text = '[{"a": 1}, {"a": tru e}, ' + ", ".join(['{"x": "%s"}' % ("y" * 50)] * 20000) + "]"
+    stream = CountingStream(text)
+    with pytest.raises(ValueError, match="offset 17"):
+        list(iter_json_array(stream, chunk_size=1024))
+    assert stream.reads <= 2
+
+
+def test_json_array_limits_one_record():
+    text = '[{"a": "' + "x" * 5000 + '"}]'
+    with pytest.raises(ValueError, match="larger than 1000 characters"):
+        list(iter_json_array(io.StringIO(text), chunk_size=100, max_record_size=1000))
+    items = list(iter_json_array(io.StringIO(text), chunk_size=100, max_record_size=10000))
+    assert len(items) == 1
+
+
+def test_json_array_deep_nesting_is_a_value_error():
+    text = "[" + "[" * 100000 + "]" * 100000 + "]"
+    with pytest.raises(ValueError, match="nested too deeply"):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def test_ndjson_reports_bad_lines_and_continues():
+    text = '{"a": 1}\n\n{bad\n' + "[" * 100000 + '\n{"b": 2}'
+    items = list(iter_ndjson(io.StringIO(text)))
+    assert [item.position for item in items] == [1, 3, 4, 5]
+    assert [item.record for item in items] == [{"a": 1}, None, None, {"b": 2}]
+    assert items[1].error.startswith("Invalid JSON")
+    assert items[2].error == "Invalid JSON: nested too deeply"
+
+
+def test_ndjson_first_chunk_split_mid_line():
+    text = '{"a": 1}\n{"b": 2}\n{"c": 3}\n'
+    for split in range(len(text) + 1):
+        items = list(iter_ndjson(io.StringIO(text[split:]), first_chunk=text[:split]))
+        assert [item.record for item in items] == [{"a": 1}, {"b": 2}, {"c": 3}], split
+
+
+def test_main_reports_malformed_array(tmp_path, capsys):
+    path = tmp_path / "records.json"
+    path.write_text('[{"a": 1}, {"b": nope}]', encoding='utf-8')
+
+    assert main(["vendor", str(path)]) == 2
+    captured = capsys.readouterr()
+    assert captured.err.startswith("error: Invalid JSON at offset 17")
+    assert [json.loads(line)["offset"] for line in captured.out.splitlines()] == [1]
+
+
+def test_vendor_messages_are_concise():
+    pytest.importorskip("jsonschema")
+    is_valid, message = get_record_validator("vendor")({"countryCode": "ZZZ"})
+    assert not is_valid
+    assert message == "'legalName' is a required property"
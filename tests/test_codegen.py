@@ -0,0 +1,55 @@
+import hashlib
+import importlib
+import json
+import os
+
+import pytest
+
+from tests.fuzz import fuzz_records
+from validation.codegen import GENERATED_VALIDATORS, REPO_ROOT, generate_source
+
+RECORD_TYPES = sorted(GENERATED_VALIDATORS)
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_generated_module_is_up_to_date(record_type):
+    schema_path, output_path = GENERATED_VALIDATORS[record_type]
+    with open(schema_path, 'rb') as f:
+        raw = f.read()
+    source_name = os.path.relpath(schema_path, REPO_ROOT).replace(os.sep, "/")
+    with open(output_path, 'r', encoding='utf-8') as f:
+        committed = f.read()
+    assert committed == generate_source(json.loads(raw), hashlib.sha256(raw).hexdigest(), source_name), (
+        "run `python -m validation.codegen`"
+    )
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_generated_validator_matches_jsonschema(record_type):
+    jsonschema = pytest.importorskip("jsonschema")
+    schema_path, _ = GENERATED_VALIDATORS[record_type]
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    generated = importlib.import_module(f"{record_type}.{record_type}_fast_validator")
+
+    records = fuzz_records(record_type, 1500)
+    verdicts = {True: 0, False: 0}
+    for record in records:
+        expected = validator.is_valid(record)
+        assert (generated.first_error(record) is None) == expected, record
+        verdicts[expected] += 1
+    # The fuzz has to exercise both outcomes to mean anything
+    assert verdicts[True] > len(records) // 10 and verdicts[False] > len(records) // 10
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_generated_rules_cover_the_schema(record_type):
+    schema_path, _ = GENERATED_VALIDATORS[record_type]
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    generated = importlib.import_module(f"{record_type}.{record_type}_fast_validator")
+    names = [name for name, _, _, _ in generated.RULES]
+    assert names == [f"properties/{p}" for p in schema.get("properties", {})] + [
+        f"allOf/{i}" for i in range(len(schema.get("allOf", [])))
+    ]
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+import pytest
+
+from benchmarks.synthetic import GENERATORS
+from tests.fuzz import fuzz_records
+from validation import columnar
+from validation.bulk import get_schema_path
+from validation.columnar import ColumnBatch, iter_csv_batches, load_columnar_schema, validate_batches
+
+RECORD_TYPES = ["vendor", "customer"]
+
+
+def _flatten(records, schema):
+    # One list per mapped field, None where the field is absent
+    columns = {}
+    for path in schema.leaves:
+        values = []
+        for record in records:
+            value = record
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append(value)
+        columns[path] = values
+    return columns
+
+
+def _assert_sound(record_type, to_column):
+    jsonschema = pytest.importorskip("jsonschema")
+    with open(get_schema_path(record_type), 'r', encoding='utf-8') as f:
+        raw_schema = json.load(f)
+    validator = jsonschema.validators.validator_for(raw_schema)(raw_schema)
+    schema = load_columnar_schema(record_type)
+
+    records = fuzz_records(record_type, 500, seed=1)
+    columns = {path: to_column(values) for path, values in _flatten(records, schema).items()}
+    batch = ColumnBatch(schema, 1, len(records), columns)
+    failing, fallback = schema.check(batch)
+
+    accepted = 0
+    for i in range(batch.num_rows):
+        record = batch.record(i)
+        valid = validator.is_valid(record)
+        if i not in failing and i not in fallback:
+            # Rows accepted column-wise are never validated one at a time
+            assert valid, record
+            accepted += 1
+    # Enough rows have to pass the column-wise checks for the test to mean anything
+    assert accepted > len(records) // 10
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_rows_accepted_column_wise_are_valid(record_type):
+    _assert_sound(record_type, lambda values: values)
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_rows_accepted_by_arrow_kernels_are_valid(record_type):
+    pyarrow = pytest.importorskip("pyarrow")
+
+    def to_column(values):
+        # String columns become Arrow arrays so their checks run as kernels
+        if all(v is None or isinstance(v, str) for v in values):
+            return pyarrow.array(values, pyarrow.string())
+        return values
+
+    _assert_sound(record_type, to_column)
+
+
+def _csv_text(records, schema):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    columns = _flatten(records, schema)
+    writer.writerow([".".join(path) for path in columns])
+    for row in zip(*columns.values()):
+        writer.writerow([
+            "" if v is None else ";".join(v) if isinstance(v, list) else str(v).lower() if isinstance(v, bool) else v
+            for v in row
+        ])
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("record_type", RECORD_TYPES)
+def test_csv_string_columns_use_arrow_kernels(record_type, monkeypatch):
+    pyarrow = pytest.importorskip("pyarrow")
+    schema = load_columnar_schema(record_type)
+    text = _csv_text(list(GENERATORS[record_type](300, invalid_ratio=0.2)), schema)
+
+    batches = list(iter_csv_batches(io.StringIO(text, newline=""), schema, batch_size=128))
+    string_columns = [path for path, rule in schema.leaves.items() if rule is not None and rule.types == ("string",)]
+    assert string_columns
+    assert all(isinstance(batch.columns[path], pyarrow.Array) for batch in batches for path in string_columns)
+    with_arrow = list(validate_batches(batches, record_type))
+
+    monkeypatch.setattr(columnar, "pyarrow", None)
+    batches = list(iter_csv_batches(io.StringIO(text, newline=""), schema, batch_size=128))
+    assert all(isinstance(batch.columns[path], list) for batch in batches for path in string_columns)
+    assert list(validate_batches(batches, record_type)) == with_arrow
+    assert any(not verdict["valid"] for verdict in with_arrow)
@@ -0,0 +1,117 @@
+import copy
+
+import pytest
+
+from benchmarks.synthetic import GENERATORS
+from validation.bulk import SourceRecord
+from validation.duplicates import MemoryIndex, SqliteIndex, find_duplicates
+
+
+def _vendor(name, business_number=None, gst_hst_number=None, duns_number=None, postal_code=None):
+    ids = {}
+    if business_number is not None:
+        ids["businessNumber"] = business_number
+    if gst_hst_number is not None:
+        ids["gstHstNumber"] = gst_hst_number
+    if duns_number is not None:
+        ids["dunsNumber"] = duns_number
+    record = {"legalName": name, "vendorIdentificationNumbers": ids}
+    if postal_code is not None:
+        record["contactInformation"] = {"address": {"postalCode": postal_code}}
+    return record
+
+
+def _find(records, record_type="vendor", index=None):
+    items = [SourceRecord("line", n, record, None) for n, record in enumerate(records, start=1)]
+    return list(find_duplicates(items, record_type, index))
+
+
+class CountingIndex(MemoryIndex):
+    def __init__(self):
+        super().__init__()
+        self.lookups = []
+
+    def first_seen(self, kind, key, position, name, field=None, value=None):
+        self.lookups.append((kind, key))
+        return super().first_seen(kind, key, position, name, field, value)
+
+
+def test_business_number_matches_program_accounts_by_root():
+    findings = _find([
+        _vendor("ABC Company", business_number="123456789"),
+        _vendor("ABC Company Inc.", business_number="123456789RC0001"),
+        _vendor("ABC Company", gst_hst_number="123456789RT0001"),
+    ])
+    assert [(f["kind"], f["field"], f["value"], f["record"]) for f in findings] == [
+        ("duplicate", "businessNumber", "123456789RC0001", {"line": 2}),
+        ("duplicate", "gstHstNumber", "123456789RT0001", {"line": 3}),
+    ]
+    assert all(
+        (f["first"], f["first_field"], f["first_value"]) == ({"line": 1}, "businessNumber", "123456789")
+        for f in findings
+    )
+
+
+def test_shared_root_on_one_record_is_looked_up_once():
+    index = CountingIndex()
+    findings = _find([
+        _vendor("ABC", business_number="123456789", gst_hst_number="123456789RT0001"),
+        _vendor("ABC", business_number="123456789RC0001", gst_hst_number="123456789RT0001"),
+    ], index=index)
+    assert index.lookups == [("businessNumberRoot", "123456789")] * 2
+    assert len(findings) == 1
+    assert findings[0]["record"] == {"line": 2}
+
+
+def test_values_without_a_root_are_compared_whole():
+    findings = _find([
+        _vendor("ABC", business_number="12345678"),
+        _vendor("ABC", business_number="12345678RC0001"),
+        _vendor("ABC", business_number="1234-5678"),
+    ])
+    assert [(f["record"], f["first"], f["value"]) for f in findings] == [
+        ({"line": 3}, {"line": 1}, "12345678"),
+    ]
+
+
+def test_duplicate_and_conflict():
+    findings = _find([
+        _vendor("Northwind Ltd.", duns_number="123456789"),
+        _vendor("NORTHWIND", duns_number="123-456-789"),
+        _vendor("Southwind Ltd.", duns_number="123456789"),
+    ])
+    assert [(f["kind"], f["record"]) for f in findings] == [
+        ("duplicate", {"line": 2}),
+        ("conflict", {"line": 3}),
+    ]
+
+
+def test_near_duplicate_only_without_identifier_match():
+    findings = _find([
+        _vendor("Café Ltée", business_number="111111111", postal_code="K1A 0B1"),
+        _vendor("Cafe", business_number="222222222", postal_code="k1a0b1"),
+        _vendor("Cafe Inc", business_number="111111111", postal_code="K1A0B1"),
+    ])
+    assert [(f["kind"], f["record"], f["first"]) for f in findings] == [
+        ("near_duplicate", {"line": 2}, {"line": 1}),
+        ("duplicate", {"line": 3}, {"line": 1}),
+    ]
+
+
+@pytest.mark.parametrize("record_type", ["vendor", "customer"])
+def test_sqlite_index_matches_memory_index(tmp_path, record_type):
+    records = list(GENERATORS[record_type](300, invalid_ratio=0.2))
+    # Repeat some records as they are and some under a different name
+    for i in range(0, 300, 7):
+        record = copy.deepcopy(records[i])
+        if i % 2:
+            record["legalName"] = f"Other {i}"
+        records.append(record)
+
+    expected = _find(records, record_type)
+    index = SqliteIndex(str(tmp_path / "index.sqlite"), batch_size=50)
+    try:
+        assert _find(records, record_type, index) == expected
+    finally:
+        index.close()
+    assert {f["kind"] for f in expected} >= {"duplicate", "conflict"}
@@ -0,0 +1,67 @@
+import pytest
+
+from validation.errors import ErrorReport
+from validation.paths import describe_branch, field_name
+
+pytest.importorskip("jsonschema")
+
+from vendor.validate_vendor import collect_vendor_errors  # noqa: E402
+
+
+def _corporation(**changes):
+    record = {
+        "legalName": "XYZ Partners LLP",
+        "countryCode": "CA",
+        "organizationType": "Corporation/Partnership",
+        "vendorIdentificationNumbers": {"supplierNumber": "PART-6789"},
+    }
+    record.update(changes)
+    return record
+
+
+def test_canadian_corporation_branch_label():
+    errors = collect_vendor_errors(_corporation())
+    assert [(e["field"], e["keyword"], e["branch"]) for e in errors] == [
+        ("/vendorIdentificationNumbers/businessNumber", "required", "Corporation/Partnership + CA"),
+    ]
+    assert errors[0]["pointer"] == "/vendorIdentificationNumbers"
+
+
+def test_branch_outside_allof_is_none():
+    errors = collect_vendor_errors(_corporation(countryCode="US", legalName=1))
+    assert [(e["field"], e["branch"]) for e in errors] == [("/legalName", None)]
+
+
+def test_else_branch_is_negated():
+    schema = {"allOf": [{
+        "if": {"properties": {"countryCode": {"enum": ["CA", "US"]}, "organizationType": {"enum": ["Employee"]}}},
+        "then": {},
+        "else": {"required": ["dunsNumber"]},
+    }]}
+    assert describe_branch(schema, ["allOf", 0, "then", "required"]) == "CA/US + Employee"
+    assert describe_branch(schema, ["allOf", 0, "else", "required"]) == "not (CA/US + Employee)"
+
+
+def test_required_errors_count_under_missing_property():
+    report = ErrorReport()
+    report.add(collect_vendor_errors({"countryCode": "CA", "organizationType": "Employee",
+                                      "vendorIdentificationNumbers": {}}))
+    report.add(collect_vendor_errors(_corporation()))
+    assert report.to_dict()["by_field"] == {
+        "/legalName": 1,
+        "/vendorIdentificationNumbers/businessNumber": 1,
+    }
+    assert report.by_rule["Corporation/Partnership + CA: /vendorIdentificationNumbers/businessNumber required"] == 1
+
+
+def test_field_name_collapses_array_indexes():
+    assert field_name("/commodityCodes/12") == "/commodityCodes/*"
+    assert field_name("/a/0/b/3") == "/a/*/b/*"
+    assert field_name("/legalName") == "/legalName"
+    assert field_name("") == ""
+
+    report = ErrorReport()
+    report.add(collect_vendor_errors(_corporation(
+        vendorIdentificationNumbers={"businessNumber": "456789123"}, commodityCodes=["1", "12345678", "2"],
+    )))
+    assert report.to_dict()["by_field"] == {"/commodityCodes/*": 2}
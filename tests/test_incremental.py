@@ -0,0 +1,103 @@
+import copy
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic import GENERATORS
+from validation import incremental
+from validation.incremental import IncrementalValidator
+
+pytest.importorskip("jsonschema")
+
+
+def _records(record_type, count, invalid_ratio=0.0):
+    return list(GENERATORS[record_type](count, invalid_ratio=invalid_ratio))
+
+
+def _run(cache_path, record_type, records, **options):
+    with IncrementalValidator(cache_path, record_type, **options) as cache:
+        verdicts = [cache.validate(record) for record in records]
+    return verdicts, cache.hits, cache.misses
+
+
+def _keys(cache_path, record_type):
+    with sqlite3.connect(cache_path) as connection:
+        rows = connection.execute(
+            "SELECT record_key FROM results WHERE record_type = ?", (record_type,)
+        ).fetchall()
+    return {key for key, in rows}
+
+
+@pytest.mark.parametrize("record_type", ["vendor", "customer"])
+def test_second_run_reuses_every_result(tmp_path, record_type):
+    cache_path = str(tmp_path / "cache.sqlite")
+    # Invalid customer records may lack customerID and are keyed by content
+    records = _records(record_type, 200, invalid_ratio=0.2)
+
+    first, hits, misses = _run(cache_path, record_type, records)
+    assert (hits, misses) == (0, len(records))
+    second, hits, misses = _run(cache_path, record_type, records)
+    assert (hits, misses) == (len(records), 0)
+    assert second == first
+
+
+def test_changed_record_is_revalidated(tmp_path):
+    cache_path = str(tmp_path / "cache.sqlite")
+    records = _records("vendor", 20)
+    _run(cache_path, "vendor", records)
+
+    changed = copy.deepcopy(records)
+    changed[3]["countryCode"] = "invalid"
+    verdicts, hits, misses = _run(cache_path, "vendor", changed)
+    assert (hits, misses) == (19, 1)
+    assert verdicts[3][0] is False
+    assert all(is_valid for i, (is_valid, _) in enumerate(verdicts) if i != 3)
+
+
+def test_schema_change_drops_results_of_that_record_type_only(tmp_path):
+    cache_path = str(tmp_path / "cache.sqlite")
+    _run(cache_path, "vendor", _records("vendor", 10))
+    _run(cache_path, "customer", _records("customer", 10))
+    customer_keys = _keys(cache_path, "customer")
+    with sqlite3.connect(cache_path) as connection:
+        connection.execute("UPDATE schemas SET schema_hash = 'stale' WHERE record_type = 'vendor'")
+
+    IncrementalValidator(cache_path, "vendor").close()
+    assert _keys(cache_path, "vendor") == set()
+    assert _keys(cache_path, "customer") == customer_keys
+    _, hits, misses = _run(cache_path, "vendor", _records("vendor", 10))
+    assert (hits, misses) == (0, 10)
+
+
+def test_evict_keeps_most_recently_used(tmp_path):
+    cache_path = str(tmp_path / "cache.sqlite")
+    records = _records("vendor", 10)
+    _run(cache_path, "vendor", records)
+    # Use records 7, 2 and 5 again, so they are the three most recent
+    _run(cache_path, "vendor", [records[7], records[2], records[5]], max_entries=3)
+
+    assert _keys(cache_path, "vendor") == {f"supplierNumber:SUPP-{i}" for i in (2, 5, 7)}
+
+
+def test_evict_with_fewer_rows_than_max_entries(tmp_path):
+    cache_path = str(tmp_path / "cache.sqlite")
+    _run(cache_path, "vendor", _records("vendor", 5), max_entries=10)
+    assert len(_keys(cache_path, "vendor")) == 5
+    _run(cache_path, "vendor", _records("vendor", 5), max_entries=5)
+    assert len(_keys(cache_path, "vendor")) == 5
+
+
+def test_trust_last_modified_skips_hash(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.sqlite")
+    records = [
+        record for record in _records("customer", 40)
+        if incremental._get(record, incremental.LAST_MODIFIED_PATH)
+    ]
+    _run(cache_path, "customer", records, trust_last_modified=True)
+
+    def fail(record):
+        raise AssertionError("record was hashed")
+
+    monkeypatch.setattr(incremental, "content_hash", fail)
+    _, hits, misses = _run(cache_path, "customer", records, trust_last_modified=True)
+    assert records and (hits, misses) == (len(records), 0)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+
+from validation import service
+from validation.codegen import REPO_ROOT
+
+SAMPLE_VENDOR = os.path.join(REPO_ROOT, "vendor", "vendor_schema", "sample_vendor.json")
+
+
+def _run_server(check, **service_options):
+    # Starts serve on a free port, runs check(port) against it, then stops it
+    async def run():
+        ready = asyncio.get_running_loop().create_future()
+        server = asyncio.create_task(service.serve("127.0.0.1", 0, ready=ready, **service_options))
+        try:
+            _, port = await asyncio.wait_for(asyncio.shield(ready), 10)
+            return await check(port)
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    return asyncio.run(run())
+
+
+async def _connect(port):
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+def _request(method, path, body=b""):
+    return (
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def _response(reader, writer):
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+async def _fetch(port, method, path, body=b""):
+    reader, writer = await _connect(port)
+    writer.write(_request(method, path, body))
+    return await _response(reader, writer)
+
+
+def _sample_vendor():
+    with open(SAMPLE_VENDOR, 'rb') as f:
+        return f.read()
+
+
+def test_valid_and_invalid_records():
+    async def check(port):
+        return (
+            await _fetch(port, "POST", "/validate/vendor", _sample_vendor()),
+            await _fetch(port, "POST", "/validate/vendor", b"{}"),
+        )
+
+    (valid_status, valid), (invalid_status, invalid) = _run_server(check)
+    assert valid_status == 200 and valid == {"valid": True, "message": "Validation successful"}
+    assert invalid_status == 200 and invalid["valid"] is False
+    assert "legalName" in invalid["message"]
+
+
+def test_valid_records_on_worker_pool():
+    async def check(port):
+        return await _fetch(port, "POST", "/validate/vendor", _sample_vendor())
+
+    status, verdict = _run_server(check, workers=1)
+    assert status == 200 and verdict["valid"] is True
+
+
+def test_bad_requests():
+    deep = b"[" * 100000 + b"]" * 100000
+
+    async def check(port):
+        return [
+            await _fetch(port, "POST", "/validate/vendor", deep),
+            await _fetch(port, "POST", "/validate/vendor", b"{not json"),
+            await _fetch(port, "POST", "/validate/supplier", b"{}"),
+            await _fetch(port, "GET", "/validate/vendor"),
+            await _fetch(port, "POST", "/metrics"),
+        ]
+
+    statuses = [status for status, _ in _run_server(check)]
+    assert statuses == [400, 400, 404, 405, 405]
+
+
+def test_full_queue_is_rejected():
+    async def check(port):
+        connections = [await _connect(port) for _ in range(8)]
+        # The requests reach the server together, before the batcher can
+        # empty the one-record queue
+        for _, writer in connections:
+            writer.write(_request("POST", "/validate/vendor", b"{}"))
+        return await asyncio.gather(*(_response(reader, writer) for reader, writer in connections))
+
+    responses = _run_server(check, queue_size=1, max_delay=0.05)
+    assert sorted({status for status, _ in responses}) == [200, 503]
+
+
+def test_batcher_survives_failed_batch(monkeypatch):
+    validate_batch = service._validate_batch
+
+    def failing_batch(record_type, records):
+        if any(record.get("fail") for record in records):
+            raise RuntimeError("boom")
+        return validate_batch(record_type, records)
+
+    monkeypatch.setattr(service, "_validate_batch", failing_batch)
+
+    async def check(port):
+        return (
+            await _fetch(port, "POST", "/validate/vendor", b'{"fail": true}'),
+            await _fetch(port, "POST", "/validate/vendor", _sample_vendor()),
+            await _fetch(port, "GET", "/metrics"),
+        )
+
+    (failed_status, failed), (status, verdict), (_, metrics) = _run_server(check, max_delay=0)
+    assert failed_status == 500 and "boom" in failed["error"]
+    assert status == 200 and verdict["valid"] is True
+    assert metrics["errors"] == 1
@@ -0,0 +1,512 @@
+import argparse
+import json
+import sys
+from collections import namedtuple
+
+from validation import metrics
+from validation.errors import ErrorReport
+
+# Characters read from the input per refill when parsing a top-level JSON array
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Largest single array element, in characters, buffered while waiting for
+# the rest of it
+DEFAULT_MAX_RECORD_SIZE = 64 << 20
+
+# A decode error this close to the end of the buffer may only mean the
+# element continues in the next chunk (a split number, literal or escape)
+_TRUNCATION_MARGIN = 32
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "+-.0123456789eE"
+
+# One record pulled from an input file. position_field is "line" for NDJSON
+# input and "offset" (character offset of the record) for JSON arrays. error
+# holds a parse error message when the record could not be decoded.
+SourceRecord = namedtuple("SourceRecord", ["position_field", "position", "record", "error"])
+
+
+def _validate_vendor_concise(vendor_data):
+    # validate_vendor reports str(error), which pretty-prints the whole schema
+    # (about 11 KB per invalid record); verdicts, cached results and service
+    # responses only need the one-line error message
+    from vendor.validate_vendor import VENDOR_SCHEMA_PATH, vendor_fast_validator
+    from validation.registry import get_compiled_schema
+
+    try:
+        error = get_compiled_schema(VENDOR_SCHEMA_PATH, vendor_fast_validator).best_error(vendor_data)
+    except Exception as e:
+        return False, str(e)
+    if error is not None:
+        return False, error.message
+    return True, "Validation successful"
+
+
+def get_record_validator(record_type):
+    """
+    Returns the single-record validation function for a record type.
+
+    Args:
+        record_type (str): Either "vendor" or "customer".
+
+    Returns:
+        callable: A function returning (bool, str) for a record, as
+            validate_vendor and validate_customer do. Vendor error messages
+            are cut to the error itself, without the schema dump.
+    """
+    if record_type == "vendor":
+        return _validate_vendor_concise
+    if record_type == "customer":
+        from customer.validate_customer import validate_customer
+        return validate_customer
+    raise ValueError(f"Unknown record type: {record_type!r}")
+
+
+def get_error_collector(record_type):
+    """
+    Returns the collect-all-errors function for a record type.
+
+    Args:
+        record_type (str): Either "vendor" or "customer".
+
+    Returns:
+        callable: collect_vendor_errors or collect_customer_errors.
+    """
+    if record_type == "vendor":
+        from vendor.validate_vendor import collect_vendor_errors
+        return collect_vendor_errors
+    if record_type == "customer":
+        from customer.validate_customer import collect_customer_errors
+        return collect_customer_errors
+    raise ValueError(f"Unknown record type: {record_type!r}")
+
+
+def get_schema_path(record_type):
+    """
+    Returns the path of the JSON schema file for a record type.
+
+    Args:
+        record_type (str): Either "vendor" or "customer".
+
+    Returns:
+        str: VENDOR_SCHEMA_PATH or CUSTOMER_SCHEMA_PATH.
+    """
+    if record_type == "vendor":
+        from vendor.validate_vendor import VENDOR_SCHEMA_PATH
+        return VENDOR_SCHEMA_PATH
+    if record_type == "customer":
+        from customer.validate_customer import CUSTOMER_SCHEMA_PATH
+        return CUSTOMER_SCHEMA_PATH
+    raise ValueError(f"Unknown record type: {record_type!r}")
+
+
+def get_fast_validator(record_type):
+    """
+    Returns the generated validator module for a record type.
+
+    Args:
+        record_type (str): Either "vendor" or "customer".
+
+    Returns:
+        module: vendor_fast_validator or customer_fast_validator, or None
+            if the generated module is missing.
+    """
+    if record_type == "vendor":
+        from vendor.validate_vendor import vendor_fast_validator
+        return vendor_fast_validator
+    if record_type == "customer":
+        from customer.validate_customer import customer_fast_validator
+        return customer_fast_validator
+    raise ValueError(f"Unknown record type: {record_type!r}")
+
+
+def iter_ndjson_lines(stream, first_chunk=""):
+    """
+    Yields the non-blank lines of newline-delimited JSON without decoding them.
+
+    Args:
+        stream: A text stream positioned after first_chunk.
+        first_chunk (str): Text already read from the stream.
+
+    Yields:
+        tuple: (1-based line number, line text).
+    """
+    def lines():
+        head, sep, rest = first_chunk.partition("\n")
+        if not sep:
+            # first_chunk holds no complete line yet
+            yield head + stream.readline()
+        else:
+            yield head + sep
+            pending = rest.split("\n")
+            for line in pending[:-1]:
+                yield line + "\n"
+            yield pending[-1] + stream.readline()
+        yield from stream
+
+    for line_number, line in enumerate(lines(), start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def decode_line(line):
+    """
+    Decodes one NDJSON line.
+
+    Returns:
+        tuple: (record, None), or (None, error message) if the line is not
+            valid JSON or is nested too deeply to decode.
+    """
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+    except RecursionError:
+        return None, "Invalid JSON: nested too deeply"
+
+
+def iter_ndjson(stream, first_chunk=""):
+    """
+    Yields records from newline-delimited JSON, one line at a time.
+
+    Blank lines are skipped. Lines that are not valid JSON, or are nested
+    too deeply to decode, are yielded with their parse error instead of a
+    record so numbering stays aligned.
+
+    Args:
+        stream: A text stream positioned after first_chunk.
+        first_chunk (str): Text already read from the stream.
+
+    Yields:
+        SourceRecord: Records tagged with their 1-based line number.
+    """
+    for line_number, line in iter_ndjson_lines(stream, first_chunk):
+        record, error = decode_line(line)
+        yield SourceRecord("line", line_number, record, error)
+
+
+def iter_json_array(stream, first_chunk="", chunk_size=DEFAULT_CHUNK_SIZE, max_record_size=DEFAULT_MAX_RECORD_SIZE):
+    """
+    Yields the elements of one top-level JSON array without loading it whole.
+
+    The input is read in chunks and each element is decoded as soon as it is
+    complete, so memory use is bounded by the largest single record. More
+    input is only read for an element that fails to decode when it may be
+    cut off at the end of the buffer; any other decode error is raised at
+    once.
+
+    Args:
+        stream: A text stream positioned after first_chunk.
+        first_chunk (str): Text already read from the stream.
+        chunk_size (int): Characters to read per refill.
+        max_record_size (int): Largest element, in characters, to buffer.
+
+    Yields:
+        SourceRecord: Records tagged with their character offset in the input.
+
+    Raises:
+        ValueError: If the input is not a well-formed JSON array, or an
+            element is larger than max_record_size or nested too deeply.
+    """
+    decoder = json.JSONDecoder()
+    buf = first_chunk
+    base = 0  # offset of buf[0] in the whole input
+    pos = 0
+    eof = False
+
+    def refill():
+        nonlocal buf, base, pos, eof
+        if pos:
+            buf = buf[pos:]
+            base += pos
+            pos = 0
+        chunk = stream.read(chunk_size)
+        if chunk:
+            buf += chunk
+        else:
+            eof = True
+
+    def refill_record():
+        # Reads more of the element starting at pos, within max_record_size
+        if len(buf) - pos >= max_record_size:
+            raise ValueError(f"Record at offset {base + pos} is larger than {max_record_size} characters")
+        refill()
+
+    def next_char():
+        # Skips whitespace and returns the next character, or "" at end of input
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ""
+            refill()
+
+    if next_char() != "[":
+        raise ValueError(f"Expected '[' at offset {base + pos}")
+    pos += 1
+
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            next_char()
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                truncated = e.msg.startswith("Unterminated string") or len(buf) - e.pos <= _TRUNCATION_MARGIN
+                if eof or not truncated:
+                    raise ValueError(f"Invalid JSON at offset {base + e.pos}: {e.msg}") from None
+                refill_record()
+                continue
+            except RecursionError:
+                raise ValueError(f"Invalid JSON at offset {base + pos}: nested too deeply") from None
+            if (not eof and isinstance(record, (int, float))
+                    and (end == len(buf) or buf[end] in _NUMBER_CHARS)):
+                # A bare number could continue in the next chunk
+                refill_record()
+                continue
+            yield SourceRecord("offset", base + pos, record, None)
+            pos = end
+
+            separator = next_char()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {base + pos - 1}")
+
+    if next_char() != "":
+        raise ValueError(f"Unexpected data after the array at offset {base + pos}")
+
+
+def detect_input_format(stream, input_format="auto"):
+    """
+    Resolves "auto" to "ndjson" or "array" from the first non-whitespace
+    character of the stream.
+
+    Returns:
+        tuple: (input format, text already read from the stream).
+    """
+    first_chunk = ""
+    if input_format == "auto":
+        while True:
+            chunk = stream.read(4096)
+            first_chunk += chunk
+            if not chunk or first_chunk.strip():
+                break
+        input_format = "array" if first_chunk.lstrip().startswith("[") else "ndjson"
+    return input_format, first_chunk
+
+
+def iter_records(stream, input_format="auto", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields records from NDJSON or a top-level JSON array.
+
+    Args:
+        stream: A text stream.
+        input_format (str): "ndjson", "array", or "auto" to detect the format
+            from the first non-whitespace character.
+        chunk_size (int): Characters to read per refill for array input.
+
+    Yields:
+        SourceRecord: Records in input order.
+    """
+    input_format, first_chunk = detect_input_format(stream, input_format)
+    if input_format == "array":
+        yield from iter_json_array(stream, first_chunk, chunk_size)
+    elif input_format == "ndjson":
+        yield from iter_ndjson(stream, first_chunk)
+    else:
+        raise ValueError(f"Unknown input format: {input_format!r}")
+
+
+def make_verdict(item, is_valid, message):
+    """Builds the NDJSON verdict for one record."""
+    return {item.position_field: item.position, "valid": is_valid, "message": message}
+
+
+def make_error_verdict(item, errors):
+    """Builds the NDJSON verdict for one record with every error listed."""
+    if item.error is not None:
+        errors = [{"pointer": "", "field": "", "keyword": "json", "message": item.error, "schema_path": "", "branch": None}]
+    if not errors:
+        message = "No validation errors"
+    else:
+        message = f"{len(errors)} validation error{'s' if len(errors) != 1 else ''}"
+    verdict = make_verdict(item, not errors, message)
+    verdict["errors"] = errors
+    return verdict
+
+
+def validate_records(items, validate):
+    """
+    Validates a stream of records one at a time.
+
+    Args:
+        items: An iterable of SourceRecord, e.g. from iter_records.
+        validate (callable): A function returning (bool, str) for a record.
+
+    Yields:
+        dict: One verdict per record, in input order.
+    """
+    for item in items:
+        if item.error is not None:
+            yield make_verdict(item, False, item.error)
+        else:
+            is_valid, message = validate(item.record)
+            yield make_verdict(item, is_valid, message)
+
+
+def collect_records_errors(items, collect):
+    """
+    Validates a stream of records, listing every error of each record.
+
+    Args:
+        items: An iterable of SourceRecord, e.g. from iter_records.
+        collect (callable): A function returning the list of errors for a
+            record, e.g. collect_vendor_errors.
+
+    Yields:
+        dict: One verdict per record, in input order, with an "errors" list.
+    """
+    for item in items:
+        yield make_error_verdict(item, collect(item.record) if item.error is None else None)
+
+
+def validate_file(path, record_type, input_format="auto"):
+    """
+    Validates every record in an NDJSON or JSON-array file.
+
+    Args:
+        path (str): Path to the input file.
+        record_type (str): Either "vendor" or "customer".
+        input_format (str): "ndjson", "array" or "auto".
+
+    Yields:
+        dict: One verdict per record, in input order.
+    """
+    validate = get_record_validator(record_type)
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from validate_records(iter_records(f, input_format), validate)
+
+
+def write_verdicts(verdicts, out, report=None):
+    """
+    Writes verdicts as NDJSON and returns (total, invalid) counts.
+
+    If an ErrorReport is given, the errors of each verdict are added to it.
+    """
+    total = invalid = 0
+    for verdict in verdicts:
+        total += 1
+        if not verdict["valid"]:
+            invalid += 1
+        if report is not None:
+            report.add(verdict.get("errors", []))
+        out.write(json.dumps(verdict))
+        out.write("\n")
+    return total, invalid
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Validate vendor or customer records from an NDJSON or JSON-array file."
+    )
+    parser.add_argument("record_type", choices=["vendor", "customer"])
+    parser.add_argument("input", help="Input file, or '-' for standard input")
+    parser.add_argument("-o", "--output", default="-",
+                        help="File for the NDJSON verdicts (default: standard output)")
+    parser.add_argument("--format", dest="input_format", default="auto",
+                        choices=["auto", "ndjson", "array"])
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Worker processes; 0 uses every CPU (default: 1, no pool)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Records per worker task when --workers is not 1")
+    parser.add_argument("--cache",
+                        help="SQLite file of results from earlier runs; only new or changed records are revalidated")
+    parser.add_argument("--cache-max-entries", type=int, default=None,
+                        help="Evict least recently used cached results beyond this count")
+    parser.add_argument("--trust-last-modified", action="store_true",
+                        help="Treat records whose accountDetails.lastModified is unchanged as unchanged")
+    parser.add_argument("--all-errors", action="store_true",
+                        help="List every error of each record instead of the first one")
+    parser.add_argument("--report",
+                        help="Write error counts per keyword, field and rule across the file to this JSON file "
+                             "(implies --all-errors)")
+    metrics.add_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.cache and args.workers != 1:
+        parser.error("--cache cannot be combined with --workers")
+    all_errors = args.all_errors or bool(args.report)
+    if args.cache and all_errors:
+        parser.error("--cache cannot be combined with --all-errors or --report")
+
+    cache = None
+    if args.cache:
+        from validation.incremental import IncrementalValidator
+        cache = IncrementalValidator(
+            args.cache,
+            args.record_type,
+            max_entries=args.cache_max_entries,
+            trust_last_modified=args.trust_last_modified,
+        )
+
+    source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    try:
+        with metrics.MetricsSession(args) as session:
+            if cache is not None:
+                verdicts = validate_records(iter_records(source, args.input_format), cache.validate)
+            elif args.workers == 1 and all_errors:
+                verdicts = collect_records_errors(
+                    iter_records(source, args.input_format), get_error_collector(args.record_type)
+                )
+            elif args.workers == 1:
+                verdicts = validate_records(
+                    iter_records(source, args.input_format), get_record_validator(args.record_type)
+                )
+            else:
+                # NDJSON lines are decoded by the workers, not here
+                from validation.parallel import DEFAULT_CHUNK_SIZE, validate_stream_parallel
+                verdicts = validate_stream_parallel(
+                    source,
+                    args.record_type,
+                    input_format=args.input_format,
+                    workers=args.workers or None,
+                    chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+                    all_errors=all_errors,
+                    collector=session.metrics,
+                )
+            report = ErrorReport() if args.report else None
+            try:
+                total, invalid = write_verdicts(verdicts, out, report)
+            except ValueError as e:
+                # A malformed JSON array cannot be resumed past the bad element
+                print(f"error: {e}", file=sys.stderr)
+                return 2
+    finally:
+        if cache is not None:
+            cache.close()
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{total} records checked, {invalid} invalid", file=sys.stderr)
+    if report is not None:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"Error report written to {args.report}", file=sys.stderr)
+    if cache is not None:
+        print(f"{cache.hits} results reused from cache, {cache.misses} records validated", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Schemas with a generated validator: record type -> (schema file, generated module)
+GENERATED_VALIDATORS = {
+    "vendor": (
+        os.path.join(REPO_ROOT, "vendor", "vendor_schema", "vendor_schema.json"),
+        os.path.join(REPO_ROOT, "vendor", "vendor_fast_validator.py"),
+    ),
+    "customer": (
+        os.path.join(REPO_ROOT, "customer", "customer_schema", "customer_schema.json"),
+        os.path.join(REPO_ROOT, "customer", "customer_fast_validator.py"),
+    ),
+}
+
+# Keywords that carry no validation rule when formats are not asserted,
+# matching what jsonschema.validate checks by default
+_ANNOTATIONS = {"$schema", "$comment", "title", "description", "default", "examples", "format"}
+
+_SUPPORTED = _ANNOTATIONS | {
+    "type", "enum", "pattern", "maxLength", "minLength", "required", "properties",
+    "items", "anyOf", "allOf", "if", "then", "else",
+}
+
+_TYPE_CHECKS = {
+    "string": "isinstance(instance, str)",
+    "object": "isinstance(instance, dict)",
+    "array": "isinstance(instance, list)",
+    "boolean": "isinstance(instance, bool)",
+    "null": "instance is None",
+    "integer": "(isinstance(instance, int) and not isinstance(instance, bool))",
+    "number": "(isinstance(instance, (int, float)) and not isinstance(instance, bool))",
+}
+
+# Upper bound on precomputed dispatch table entries for one allOf
+_MAX_DISPATCH_ENTRIES = 4096
+
+_PREAMBLE = '''\
+import re
+
+SCHEMA_SHA256 = {sha256!r}
+
+_MISSING = object()
+_OTHER = object()
+
+
+def _token(value, literals):
+    # Reduces a discriminator value to a dispatch table key
+    if value is _MISSING:
+        return _MISSING
+    if isinstance(value, str) and value in literals:
+        return value
+    return _OTHER
+'''
+
+_EPILOGUE = '''
+
+def first_error(instance):
+    """
+    Returns the message for the first schema violation found, or None if the
+    instance is valid.
+    """
+    return {root}(instance)
+
+
+def is_valid(instance):
+    """Returns True if the instance is valid against the schema."""
+    return {root}(instance) is None
+'''
+
+
+class CodegenError(ValueError):
+    """Raised when a schema uses a keyword the generator cannot compile."""
+
+
+class _Generator:
+    """
+    Compiles a JSON schema into Python source. Every subschema becomes a
+    function that returns an error message, or None when the instance passes.
+    """
+
+    def __init__(self):
+        self.constants = []
+        self.tables = []
+        self.functions = []
+        # id() of each schema whose allOf is dispatched -> selector function
+        self.selectors = {}
+        self._ids = itertools.count()
+        # Identical subschemas and constants are emitted once
+        self._compiled = {}
+        self._constants = {}
+
+    def _name(self, prefix):
+        return f"{prefix}{next(self._ids)}"
+
+    def _constant(self, prefix, expression):
+        if expression not in self._constants:
+            name = self._name(prefix)
+            self.constants.append(f"{name} = {expression}")
+            self._constants[expression] = name
+        return self._constants[expression]
+
+    def compile(self, schema):
+        """Compiles a subschema and returns the name of its check function."""
+        key = json.dumps(schema, sort_keys=True)
+        if key not in self._compiled:
+            self._compiled[key] = self._compile(schema)
+        return self._compiled[key]
+
+    def _compile(self, schema):
+        if schema is True or schema == {}:
+            return self._function(["return None"])
+        if schema is False:
+            return self._function(["return repr(instance) + ' is not allowed'"])
+        if not isinstance(schema, dict):
+            raise CodegenError(f"Unsupported schema: {schema!r}")
+        unsupported = set(schema) - _SUPPORTED
+        if unsupported:
+            raise CodegenError(f"Unsupported keywords: {sorted(unsupported)}")
+
+        body = []
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        known = types[0] if types and len(types) == 1 else None
+
+        if types:
+            unknown = set(types) - set(_TYPE_CHECKS)
+            if unknown:
+                raise CodegenError(f"Unsupported types: {sorted(unknown)}")
+            condition = " or ".join(_TYPE_CHECKS[t] for t in types)
+            message = " is not of type " + ", ".join(repr(t) for t in types)
+            body += [f"if not ({condition}):", f"    return repr(instance) + {message!r}"]
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if not all(isinstance(v, str) for v in values):
+                raise CodegenError("Only string enums are supported")
+            literals = self._constant("_ENUM", f"frozenset({sorted(set(values))!r})")
+            check = f"instance in {literals}"
+            if known != "string":
+                check = f"isinstance(instance, str) and {check}"
+            body += [f"if not ({check}):", f"    return repr(instance) + {' is not one of ' + repr(values)!r}"]
+
+        body += self._guarded(known, "string", "str", self._string_checks(schema))
+        body += self._guarded(known, "object", "dict", self._object_checks(schema))
+        body += self._guarded(known, "array", "list", self._array_checks(schema))
+        body += self._combinator_checks(schema)
+        body.append("return None")
+        return self._function(body)
+
+    def _function(self, body):
+        name = self._name("_v")
+        lines = [f"def {name}(instance):"] + ["    " + line for line in body]
+        self.functions.append("\n".join(lines))
+        return name
+
+    @staticmethod
+    def _guarded(known, type_name, python_type, lines):
+        # Keywords for one type only apply to instances of that type
+        if not lines or known == type_name:
+            return lines
+        return [f"if isinstance(instance, {python_type}):"] + ["    " + line for line in lines]
+
+    def _string_checks(self, schema):
+        lines = []
+        if "maxLength" in schema:
+            lines += [f"if len(instance) > {int(schema['maxLength'])}:", "    return repr(instance) + ' is too long'"]
+        if "minLength" in schema:
+            lines += [f"if len(instance) < {int(schema['minLength'])}:", "    return repr(instance) + ' is too short'"]
+        if "pattern" in schema:
+            pattern = schema["pattern"]
+            search = self._constant("_PATTERN", f"re.compile({pattern!r}).search")
+            lines += [f"if {search}(instance) is None:", f"    return repr(instance) + {' does not match ' + repr(pattern)!r}"]
+        return lines
+
+    def _object_checks(self, schema):
+        lines = []
+        for prop in schema.get("required", []):
+            lines += [f"if {prop!r} not in instance:", f"    return {repr(prop) + ' is a required property'!r}"]
+        for prop, subschema in schema.get("properties", {}).items():
+            check = self.compile(subschema)
+            lines += [
+                f"value = instance.get({prop!r}, _MISSING)",
+                "if value is not _MISSING:",
+                f"    error = {check}(value)",
+                "    if error is not None:",
+                "        return error",
+            ]
+        return lines
+
+    def _array_checks(self, schema):
+        if "items" not in schema:
+            return []
+        if not isinstance(schema["items"], (dict, bool)):
+            raise CodegenError("Only a single 'items' schema is supported")
+        check = self.compile(schema["items"])
+        return [
+            "for item in instance:",
+            f"    error = {check}(item)",
+            "    if error is not None:",
+            "        return error",
+        ]
+
+    def _combinator_checks(self, schema):
+        lines = []
+        if "anyOf" in schema:
+            checks = [self.compile(s) for s in schema["anyOf"]]
+            condition = " and ".join(f"{c}(instance) is not None" for c in checks)
+            lines += [f"if {condition}:", "    return repr(instance) + ' is not valid under any of the given schemas'"]
+
+        if "if" in schema:
+            lines += self._conditional(schema)
+
+        if "allOf" in schema:
+            dispatched = [s for s in schema["allOf"] if _discriminators(s) is not None]
+            if len(dispatched) < 2 or not self._dispatch_fits(dispatched):
+                dispatched = []
+            for subschema in schema["allOf"]:
+                if not any(subschema is d for d in dispatched):
+                    check = self.compile(subschema)
+                    lines += [f"error = {check}(instance)", "if error is not None:", "    return error"]
+            if dispatched:
+                selector, dispatch_lines = self._dispatch(dispatched)
+                self.selectors[id(schema)] = selector
+                lines += dispatch_lines
+        return lines
+
+    def _conditional(self, schema):
+        condition = self.compile(schema["if"])
+        then = self.compile(schema["then"]) if "then" in schema else None
+        otherwise = self.compile(schema["else"]) if "else" in schema else None
+        if then is None and otherwise is None:
+            return []
+        lines = [f"if {condition}(instance) is None:"]
+        lines += [f"    error = {then}(instance)" if then else "    error = None"]
+        lines += ["else:"]
+        lines += [f"    error = {otherwise}(instance)" if otherwise else "    error = None"]
+        lines += ["if error is not None:", "    return error"]
+        return lines
+
+    @staticmethod
+    def _dispatch_fits(branches):
+        literals = _branch_literals(branches)
+        entries = 1
+        for values in literals.values():
+            entries *= len(values) + 2
+        return entries <= _MAX_DISPATCH_ENTRIES
+
+    def _dispatch(self, branches):
+        """
+        Compiles allOf if/then branches whose conditions only test property
+        values against enums into a lookup table. The record's discriminator
+        values select the list of applicable 'then' checks directly instead of
+        evaluating every 'if'.
+
+        Returns the name of the generated selector function, which returns
+        the applicable checks for an instance, and the lines that run them.
+        """
+        literals = _branch_literals(branches)
+        keys = sorted(literals)
+        literal_names = {k: self._constant("_LITERALS", f"frozenset({sorted(literals[k])!r})") for k in keys}
+        thens = [self.compile(b.get("then", True)) for b in branches]
+
+        table = {}
+        choices = [[repr(v) for v in sorted(literals[k])] + ["_MISSING", "_OTHER"] for k in keys]
+        for combination in itertools.product(*choices):
+            token = dict(zip(keys, combination))
+            applicable = []
+            for branch, then in zip(branches, thens):
+                conditions = _discriminators(branch)
+                # A property that is absent satisfies its 'if' condition
+                if all(token[k] == "_MISSING" or token[k] in map(repr, values) for k, values in conditions.items()):
+                    applicable.append(then)
+            if applicable:
+                table[f"({', '.join(combination)},)"] = f"({', '.join(applicable)},)"
+
+        table_name = self._name("_DISPATCH")
+        entries = "".join(f"\n    {k}: {v}," for k, v in table.items())
+        self.tables.append(f"{table_name} = {{{entries}\n}}")
+        every = f"({', '.join(thens)},)"
+
+        key = ", ".join(f"_token(instance.get({k!r}, _MISSING), {literal_names[k]})" for k in keys)
+        selector = self._name("_select")
+        self.functions.append("\n".join([
+            f"def {selector}(instance):",
+            "    # Returns the 'then' checks that apply to the instance",
+            "    if isinstance(instance, dict):",
+            f"        return {table_name}.get(({key},), ())",
+            # Property conditions hold vacuously for non-objects
+            f"    return {every}",
+        ]))
+        return selector, [
+            f"for check in {selector}(instance):",
+            "    error = check(instance)",
+            "    if error is not None:",
+            "        return error",
+        ]
+
+
+def _discriminators(subschema):
+    """
+    Returns {property: enum values} if the subschema is an if/then whose 'if'
+    only requires properties to be in string enums, else None.
+    """
+    if not isinstance(subschema, dict) or set(subschema) - {"if", "then"} or "if" not in subschema:
+        return None
+    condition = subschema["if"]
+    if not isinstance(condition, dict) or set(condition) != {"properties"}:
+        return None
+    result = {}
+    for prop, prop_schema in condition["properties"].items():
+        if not isinstance(prop_schema, dict) or set(prop_schema) != {"enum"}:
+            return None
+        if not all(isinstance(v, str) for v in prop_schema["enum"]):
+            return None
+        result[prop] = set(prop_schema["enum"])
+    return result
+
+
+def _branch_literals(branches):
+    literals = {}
+    for branch in branches:
+        for prop, values in _discriminators(branch).items():
+            literals.setdefault(prop, set()).update(values)
+    return literals
+
+
+def _literal(value, depth=0):
+    """
+    Formats a JSON value as an indented Python literal. Lists of scalars are
+    kept on one line.
+    """
+    indent = "    " * (depth + 1)
+    if isinstance(value, dict) and value:
+        items = [f"{indent}{key!r}: {_literal(item, depth + 1)}," for key, item in value.items()]
+    elif isinstance(value, list) and any(isinstance(item, (dict, list)) for item in value):
+        items = [f"{indent}{_literal(item, depth + 1)}," for item in value]
+    else:
+        return repr(value)
+    brackets = "{}" if isinstance(value, dict) else "[]"
+    return brackets[0] + "\n" + "\n".join(items) + "\n" + "    " * depth + brackets[1]
+
+
+def _rules(generator, schema):
+    """
+    Returns the source of the RULES constant: the check function of each
+    top-level property and allOf entry of the root schema, for
+    validation.metrics.RuleProfiler.
+    """
+    if not isinstance(schema, dict):
+        return "RULES = ()"
+    entries = []
+    for prop, subschema in schema.get("properties", {}).items():
+        entries.append(f"    ({'properties/' + prop!r}, ({prop!r},), {generator.compile(subschema)}, None),")
+    selector = generator.selectors.get(id(schema))
+    for i, entry in enumerate(schema.get("allOf", [])):
+        if selector is not None and _discriminators(entry) is not None:
+            # Dispatched: the check only runs when the selector returns it
+            check, entry_selector = generator.compile(entry.get("then", True)), selector
+        else:
+            check, entry_selector = generator.compile(entry), None
+        entries.append(f"    ('allOf/{i}', (), {check}, {entry_selector}),")
+    return "RULES = (" + "".join("\n" + e for e in entries) + "\n)"
+
+
+def generate_source(schema, sha256, source_name):
+    """
+    Generates the source of a Python module that validates the schema.
+
+    Args:
+        schema (dict): The JSON schema to compile.
+        sha256 (str): Hex digest of the schema file, recorded in the module.
+        source_name (str): Schema file name for the module header.
+
+    Returns:
+        str: Python source code.
+
+    Raises:
+        CodegenError: If the schema uses unsupported keywords.
+    """
+    generator = _Generator()
+    root = generator.compile(schema)
+    rules = _rules(generator, schema)
+    parts = [
+        f"# Generated by validation/codegen.py from {source_name}.\n"
+        "# Do not edit by hand; run `python -m validation.codegen` after changing the schema.\n"
+        + _PREAMBLE.format(sha256=sha256).rstrip("\n"),
+        # The schema itself, so the registry can load it from the compiled module
+        "SCHEMA = " + _literal(schema),
+        "\n".join(generator.constants),
+        "\n\n\n".join(generator.functions),
+        "\n\n".join(generator.tables),
+        "# Top-level rules as (name, property path, check, selector), timed by\n"
+        "# validation.metrics.RuleProfiler. A check with a selector only runs when\n"
+        "# selector(instance) returns it.\n" + rules,
+    ]
+    return "\n\n\n".join(p for p in parts if p) + "\n" + _EPILOGUE.format(root=root)
+
+
+def generate_module(schema_path, output_path):
+    """
+    Writes the generated validator module for a schema file.
+
+    The schema is checked against its meta-schema first; the registry relies
+    on that check when it loads the schema from the generated module.
+
+    Args:
+        schema_path (str): Path to the JSON schema file.
+        output_path (str): Path of the Python module to write.
+
+    Raises:
+        jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+    """
+    from validation.registry import load_jsonschema
+
+    with open(schema_path, 'rb') as f:
+        raw = f.read()
+    schema = json.loads(raw)
+    load_jsonschema().validators.validator_for(schema).check_schema(schema)
+    source_name = os.path.relpath(schema_path, REPO_ROOT).replace(os.sep, "/")
+    source = generate_source(schema, hashlib.sha256(raw).hexdigest(), source_name)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    print(f"Generated validator written to {output_path}")
+
+
+def cross_check(items, record_type):
+    """
+    Compares the generated validator with the generic jsonschema validator.
+
+    Args:
+        items: An iterable of SourceRecord, e.g. from validation.bulk.iter_records.
+        record_type (str): Either "vendor" or "customer".
+
+    Yields:
+        dict: One entry per record on which the two validators disagree.
+    """
+    from validation.registry import get_compiled_schema
+
+    schema_path, output_path = GENERATED_VALIDATORS[record_type]
+    compiled = get_compiled_schema(schema_path)
+    namespace = {}
+    with open(output_path, 'r', encoding='utf-8') as f:
+        exec(compile(f.read(), output_path, "exec"), namespace)
+    if namespace["SCHEMA_SHA256"] != compiled.sha256:
+        raise RuntimeError(f"{output_path} is out of date; run `python -m validation.codegen`")
+
+    for item in items:
+        if item.error is not None:
+            continue
+        fast_error = namespace["first_error"](item.record)
+        generic_valid = compiled.validator.is_valid(item.record)
+        if (fast_error is None) != generic_valid:
+            yield {
+                item.position_field: item.position,
+                "generated": fast_error,
+                "jsonschema": "valid" if generic_valid else compiled.best_error(item.record).message,
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate fast-path validator modules from the vendor and customer schemas."
+    )
+    parser.add_argument("--check", nargs=2, metavar=("RECORD_TYPE", "INPUT"),
+                        help="Instead of generating, compare generated and jsonschema verdicts on a file")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        from validation.bulk import iter_records
+
+        record_type, path = args.check
+        mismatches = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for mismatch in cross_check(iter_records(f), record_type):
+                mismatches += 1
+                print(json.dumps(mismatch))
+        print(f"{mismatches} mismatches", file=sys.stderr)
+        return 1 if mismatches else 0
+
+    for schema_path, output_path in GENERATED_VALIDATORS.values():
+        generate_module(schema_path, output_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,745 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from validation import metrics
+from validation.bulk import (
+    SourceRecord,
+    get_error_collector,
+    get_record_validator,
+    get_schema_path,
+    make_error_verdict,
+    make_verdict,
+    write_verdicts,
+)
+from validation.errors import ErrorReport
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+except ImportError:
+    pyarrow = None
+    pc = None
+
+# Rows checked together; each batch holds one list (or Arrow array) per column
+DEFAULT_BATCH_SIZE = 65536
+
+# Messages validate_vendor and validate_customer return for valid records
+VALID_MESSAGES = {"vendor": "Validation successful", "customer": "Customer record is valid."}
+
+# Separator between the elements of an array field in a CSV cell
+ARRAY_SEPARATOR = ";"
+
+# Keywords that carry no validation rule when formats are not asserted,
+# matching validation/codegen.py
+_ANNOTATIONS = {"$schema", "$comment", "title", "description", "default", "examples", "format"}
+
+_LEAF_KEYWORDS = {"type", "pattern", "enum", "const", "maxLength", "minLength", "items"}
+_OBJECT_KEYWORDS = {"type", "properties", "required", "anyOf"}
+
+# Python classes of each JSON type. bool is excluded from integer and number
+# separately, as it is a subclass of int.
+_TYPE_CLASSES = {
+    "string": (str,),
+    "boolean": (bool,),
+    "array": (list,),
+    "integer": (int,),
+    "number": (int, float),
+    "null": (type(None),),
+}
+
+_CSV_TRUE = {"true", "t", "yes", "y", "1"}
+_CSV_FALSE = {"false", "f", "no", "n", "0"}
+
+# Checks on one field. types is a tuple of JSON types or None, enum a
+# frozenset of strings or None, items the LeafRule for array elements.
+LeafRule = namedtuple("LeafRule", ["path", "types", "pattern", "enum", "max_length", "min_length", "items"])
+
+# Checks on an object: keys it requires, and anyOf groups of which at least
+# one must have all its keys present. Only applied when the object is present.
+ObjectRule = namedtuple("ObjectRule", ["path", "required", "any_of"])
+
+# Leaf and object rules that together stand for one schema
+RuleSet = namedtuple("RuleSet", ["leaves", "objects"])
+
+# One allOf entry. condition, then and else_ are RuleSets, or None when the
+# part is absent; unsupported names the parts ("if", "then", "else") that
+# could not be turned into rules. An entry without 'if' is held in then.
+Branch = namedtuple("Branch", ["condition", "then", "else_", "unsupported"])
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _compile_leaf(node, path):
+    unknown = set(node) - _ANNOTATIONS - _LEAF_KEYWORDS
+    if unknown:
+        raise _Unsupported(f"{'.'.join(path)}: {sorted(unknown)}")
+    types = node.get("type")
+    if isinstance(types, str):
+        types = (types,)
+    if types is not None and any(t not in _TYPE_CLASSES for t in types):
+        raise _Unsupported(f"{'.'.join(path)}: type {types}")
+    enum = node.get("enum")
+    if "const" in node:
+        enum = [node["const"]] if enum is None else [v for v in enum if v == node["const"]]
+    if enum is not None:
+        if not all(isinstance(v, str) for v in enum):
+            raise _Unsupported(f"{'.'.join(path)}: non-string enum")
+        enum = frozenset(enum)
+    items = node.get("items")
+    if items is not None:
+        if not isinstance(items, dict):
+            raise _Unsupported(f"{'.'.join(path)}: tuple items")
+        items = _compile_leaf(items, path)
+    return LeafRule(
+        tuple(path),
+        tuple(types) if types is not None else None,
+        re.compile(node["pattern"]) if "pattern" in node else None,
+        enum,
+        node.get("maxLength"),
+        node.get("minLength"),
+        items,
+    )
+
+
+def _is_object_node(node):
+    return node.get("type") == "object" or any(k in node for k in ("properties", "required", "anyOf"))
+
+
+def _compile_rules(node, path=(), rules=None):
+    """
+    Turns a schema, or the part of one under path, into a RuleSet.
+
+    Raises:
+        _Unsupported: If the schema uses a keyword that has no column-wise check.
+    """
+    if rules is None:
+        rules = RuleSet({}, [])
+    if not _is_object_node(node):
+        rules.leaves[path] = _compile_leaf(node, path)
+        return rules
+
+    unknown = set(node) - _ANNOTATIONS - _OBJECT_KEYWORDS
+    if unknown or node.get("type", "object") != "object":
+        raise _Unsupported(f"{'.'.join(path) or 'root'}: {sorted(unknown) or node.get('type')}")
+    any_of = []
+    for option in node.get("anyOf", []):
+        if set(option) - _ANNOTATIONS - {"required"}:
+            raise _Unsupported(f"{'.'.join(path) or 'root'}: anyOf beyond required")
+        any_of.append(tuple(option.get("required", ())))
+    rules.objects.append(ObjectRule(path, tuple(node.get("required", ())), [tuple(g) for g in any_of]))
+    for name, subschema in node.get("properties", {}).items():
+        _compile_rules(subschema, path + (name,), rules)
+    return rules
+
+
+class ColumnarSchema:
+    """
+    Column-wise checks derived from a record schema.
+
+    The unconditional part of the schema (types, patterns, enums, lengths and
+    required keys) becomes one rule per field. Each conditional allOf branch
+    is split into its 'if' and 'then'/'else' rules, which are evaluated
+    column-wise too; the 'if' rules select the rows a branch applies to. Any
+    part of the schema that has no column-wise equivalent is reported as
+    unsupported, and the rows it could apply to are validated one at a time.
+
+    Attributes:
+        leaves (dict): Field path (tuple of keys) -> LeafRule, for every field
+            a column can map to.
+        base (RuleSet): Rules that apply to every row, or None if the
+            schema could not be converted.
+        branches (list): One Branch per allOf entry.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.branches = []
+        base = {k: v for k, v in schema.items() if k != "allOf"}
+        try:
+            self.base = _compile_rules(base)
+        except _Unsupported:
+            self.base = None
+        self.leaves = self.base.leaves if self.base is not None else _leaf_paths(base)
+        self._object_paths = {
+            path[:i] for path in self.leaves for i in range(len(path))
+        }
+        for entry in schema.get("allOf", []):
+            self.branches.append(self._compile_branch(entry))
+
+    @staticmethod
+    def _compile_branch(entry):
+        if "if" not in entry:
+            try:
+                return Branch(None, _compile_rules(entry), None, ())
+            except _Unsupported:
+                return Branch(None, None, None, ("if",))
+        if set(entry) - _ANNOTATIONS - {"if", "then", "else"}:
+            return Branch(None, None, None, ("if",))
+        try:
+            condition = _compile_rules(entry["if"])
+        except _Unsupported:
+            return Branch(None, None, None, ("if",))
+        parts = []
+        unsupported = []
+        for key in ("then", "else"):
+            try:
+                parts.append(_compile_rules(entry[key]) if key in entry else None)
+            except _Unsupported:
+                parts.append(None)
+                unsupported.append(key)
+        return Branch(condition, parts[0], parts[1], tuple(unsupported))
+
+    def map_columns(self, names, overrides=None):
+        """
+        Maps column names to field paths.
+
+        A column maps to a field when its name is the dotted field path (e.g.
+        "contactInformation.address.postalCode"), when it is the field's own
+        name and no other field has that name (e.g. "postalCode"), or when
+        overrides names the field for it. Other columns are ignored.
+
+        Args:
+            names (list): Column names, in file order.
+            overrides (dict): Column name -> dotted field path.
+
+        Returns:
+            dict: Column name -> field path, for the mapped columns.
+
+        Raises:
+            ValueError: If an override names an unknown field, or two columns
+                map to the same field.
+        """
+        overrides = overrides or {}
+        dotted = {".".join(path): path for path in self.leaves}
+        by_name = {}
+        for path in self.leaves:
+            by_name.setdefault(path[-1], []).append(path)
+
+        mapping = {}
+        for name in names:
+            if name in overrides:
+                if overrides[name] not in dotted:
+                    raise ValueError(f"Column {name!r} is mapped to unknown field {overrides[name]!r}")
+                mapping[name] = dotted[overrides[name]]
+            elif name in dotted:
+                mapping[name] = dotted[name]
+            elif len(by_name.get(name, ())) == 1:
+                mapping[name] = by_name[name][0]
+
+        seen = {}
+        for name, path in mapping.items():
+            if path in seen:
+                raise ValueError(f"Columns {seen[path]!r} and {name!r} both map to {'.'.join(path)}")
+            seen[path] = name
+        return mapping
+
+    def check(self, batch):
+        """
+        Runs the column-wise checks on a batch.
+
+        Returns:
+            tuple: (failing, fallback) - sets of row indexes that broke a rule,
+                and of rows that need a per-row check because a rule that
+                applies to them could not be evaluated column-wise.
+        """
+        every_row = set(range(batch.num_rows))
+        if self.base is None:
+            return set(), every_row
+
+        failing = _failures(self.base, batch)
+        fallback = set()
+        for branch in self.branches:
+            if "if" in branch.unsupported:
+                fallback |= every_row
+                continue
+            if branch.condition is None:
+                failing |= _failures(branch.then, batch)
+                continue
+            # Rows the 'if' rejects are the ones its 'else' applies to
+            outside = _failures(branch.condition, batch)
+            if branch.then is not None:
+                failing |= _failures(branch.then, batch) - outside
+            if branch.else_ is not None:
+                failing |= _failures(branch.else_, batch) & outside
+            if "then" in branch.unsupported:
+                fallback |= every_row - outside
+            if "else" in branch.unsupported:
+                fallback |= outside
+        return failing, fallback - failing
+
+    def is_object(self, path):
+        """Returns whether path is an object that holds mapped fields."""
+        return path in self._object_paths
+
+
+def _leaf_paths(node, path=()):
+    # Field paths of a schema whose rules could not all be converted
+    leaves = {}
+    properties = node.get("properties")
+    if not properties:
+        return {path: None} if path else {}
+    for name, subschema in properties.items():
+        leaves.update(_leaf_paths(subschema, path + (name,)))
+    return leaves
+
+
+class ColumnBatch:
+    """
+    A block of rows stored column by column.
+
+    Attributes:
+        start (int): 1-based row number of the first row.
+        num_rows (int): Number of rows.
+        columns (dict): Field path -> list of values, or a pyarrow Array.
+            None means the field is absent from that row.
+        errors (dict): Row index -> message, for rows that could not be read.
+    """
+
+    def __init__(self, schema, start, num_rows, columns, errors=None):
+        self.schema = schema
+        self.start = start
+        self.num_rows = num_rows
+        self.columns = columns
+        self.errors = errors or {}
+        self._absent = {}
+        self._values = {}
+
+    def values(self, path):
+        """Returns the column for a field as a list of Python values."""
+        if path not in self._values:
+            column = self.columns.get(path)
+            if column is None:
+                self._values[path] = [None] * self.num_rows
+            elif isinstance(column, list):
+                self._values[path] = column
+            else:
+                self._values[path] = column.to_pylist()
+        return self._values[path]
+
+    def absent(self, path):
+        """
+        Returns, per row, whether the field or object at path is missing.
+
+        An object is present when any field under it has a value, which is
+        how record() builds it.
+        """
+        if path not in self._absent:
+            if path in self.columns:
+                column = self.columns[path]
+                if isinstance(column, list):
+                    absent = [v is None for v in column]
+                else:
+                    absent = column.is_null().to_pylist()
+            elif self.schema.is_object(path):
+                under = [self.absent(p) for p in self.columns if p[:len(path)] == path]
+                absent = [all(flags) for flags in zip(*under)] if under else [True] * self.num_rows
+            else:
+                absent = [True] * self.num_rows
+            self._absent[path] = absent
+        return self._absent[path]
+
+    def record(self, index):
+        """Builds the nested record for one row."""
+        record = {}
+        for path in self.columns:
+            value = self.values(path)[index]
+            if value is None:
+                continue
+            target = record
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+        return record
+
+
+def _failures(rules, batch):
+    # Row indexes breaking any rule of a RuleSet
+    failing = set()
+    for rule in rules.leaves.values():
+        if rule.path in batch.columns:
+            failing.update(_leaf_failures(rule, batch))
+    for rule in rules.objects:
+        failing.update(_object_failures(rule, batch))
+    return failing
+
+
+def _object_failures(rule, batch):
+    if not rule.required and not rule.any_of:
+        return []
+    # The rule only applies where the object itself is present
+    missing = batch.absent(rule.path) if rule.path else None
+    required = [batch.absent(rule.path + (key,)) for key in rule.required]
+    groups = [[batch.absent(rule.path + (key,)) for key in group] for group in rule.any_of]
+    failing = []
+    for i in range(batch.num_rows):
+        if missing is not None and missing[i]:
+            continue
+        if any(absent[i] for absent in required):
+            failing.append(i)
+        elif groups and all(any(absent[i] for absent in group) for group in groups):
+            failing.append(i)
+    return failing
+
+
+def _leaf_failures(rule, batch):
+    column = batch.columns[rule.path]
+    if not isinstance(column, list) and _is_arrow_string(column):
+        failing = _arrow_string_failures(rule, column)
+        if failing is not None:
+            return failing
+    return _value_failures(rule, batch.values(rule.path))
+
+
+def _value_failures(rule, values):
+    # Column-wise checks on Python values; each keyword is one pass over the column
+    failing = set()
+    if rule.types is not None:
+        classes = tuple(c for t in rule.types for c in _TYPE_CLASSES[t])
+        allow_bool = "boolean" in rule.types
+        failing.update(i for i, v in enumerate(values)
+                       if v is not None and (not isinstance(v, classes) or v.__class__ is bool and not allow_bool))
+    if rule.pattern is not None or rule.max_length is not None or rule.min_length is not None:
+        strings = [(i, v) for i, v in enumerate(values) if isinstance(v, str)]
+    if rule.pattern is not None:
+        search = rule.pattern.search
+        failing.update(i for i, v in strings if not search(v))
+    if rule.max_length is not None:
+        limit = rule.max_length
+        failing.update(i for i, v in strings if len(v) > limit)
+    if rule.min_length is not None:
+        limit = rule.min_length
+        failing.update(i for i, v in strings if len(v) < limit)
+    if rule.enum is not None:
+        enum = rule.enum
+        failing.update(i for i, v in enumerate(values)
+                       if v is not None and not (isinstance(v, str) and v in enum))
+    if rule.items is not None:
+        # Elements of every array are checked as one column. Null elements
+        # are left for the per-row check to judge.
+        rows = []
+        elements = []
+        for i, v in enumerate(values):
+            if isinstance(v, list):
+                if None in v:
+                    failing.add(i)
+                rows.extend([i] * len(v))
+                elements.extend(v)
+        failing.update(rows[j] for j in _value_failures(rule.items, elements))
+    return failing
+
+
+def _is_arrow_string(column):
+    return pyarrow.types.is_string(column.type) or pyarrow.types.is_large_string(column.type)
+
+
+def _arrow_string_failures(rule, column):
+    """
+    Runs the string checks of a rule as Arrow compute kernels.
+
+    Returns None when a pattern cannot be compiled by Arrow's regex engine,
+    so the caller falls back to Python. Arrow's '$' does not match before a
+    trailing newline as Python's does, which can only flag extra rows; those
+    are rechecked one at a time.
+    """
+    masks = []
+    try:
+        if rule.pattern is not None:
+            masks.append(pc.invert(pc.match_substring_regex(column, rule.pattern.pattern)))
+    except pyarrow.ArrowInvalid:
+        return None
+    if rule.max_length is not None or rule.min_length is not None:
+        lengths = pc.utf8_length(column)
+        if rule.max_length is not None:
+            masks.append(pc.greater(lengths, rule.max_length))
+        if rule.min_length is not None:
+            masks.append(pc.less(lengths, rule.min_length))
+    if rule.enum is not None:
+        masks.append(pc.invert(pc.is_in(column, value_set=pyarrow.array(sorted(rule.enum), column.type))))
+    if rule.types is not None and "string" not in rule.types:
+        masks.append(column.is_valid())
+    if not masks:
+        return ()
+    mask = masks[0]
+    for other in masks[1:]:
+        mask = pc.or_(mask, other)
+    mask = pc.and_(pc.fill_null(mask, False), column.is_valid())
+    return pc.indices_nonzero(mask).to_pylist()
+
+
+def _convert_csv_column(values, rule):
+    # Empty cells are absent fields; other cells are parsed by the field's type
+    types = rule.types if rule is not None and rule.types is not None else ("string",)
+    if "string" in types:
+        if pyarrow is not None:
+            # So the string checks run as Arrow compute kernels, as for Parquet
+            column = pyarrow.array(values, pyarrow.string())
+            return pc.if_else(pc.equal(column, ""), pyarrow.scalar(None, pyarrow.string()), column)
+        return [v if v != "" else None for v in values]
+    if "boolean" in types:
+        converted = []
+        for v in values:
+            lowered = v.strip().lower()
+            if lowered in _CSV_TRUE:
+                converted.append(True)
+            elif lowered in _CSV_FALSE:
+                converted.append(False)
+            else:
+                converted.append(v if v != "" else None)
+        return converted
+    if "array" in types:
+        return [[x.strip() for x in v.split(ARRAY_SEPARATOR)] if v != "" else None for v in values]
+    if "integer" in types or "number" in types:
+        converted = []
+        for v in values:
+            try:
+                converted.append(int(v))
+            except ValueError:
+                try:
+                    converted.append(float(v))
+                except ValueError:
+                    converted.append(v if v != "" else None)
+        return converted
+    return [v if v != "" else None for v in values]
+
+
+def iter_csv_batches(stream, schema, overrides=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Reads a CSV file with a header row in column-wise batches.
+
+    Cells are converted by the type of the field their column maps to:
+    booleans from true/false, yes/no or 1/0, arrays split on ARRAY_SEPARATOR.
+    String columns become Arrow arrays when pyarrow is installed, so their
+    checks run as Arrow compute kernels. Empty cells are treated as absent
+    fields. Rows with the wrong number of
+    cells are reported as errors.
+
+    Args:
+        stream: A text stream opened with newline="".
+        schema (ColumnarSchema): Schema the columns are mapped onto.
+        overrides (dict): Column name -> dotted field path.
+        batch_size (int): Rows per batch.
+
+    Yields:
+        ColumnBatch: Batches in file order.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    mapping = schema.map_columns(header, overrides)
+    selected = [(index, mapping[name]) for index, name in enumerate(header) if name in mapping]
+
+    start = 1
+    while True:
+        rows = []
+        errors = {}
+        for row in reader:
+            if len(row) != len(header):
+                errors[len(rows)] = f"Expected {len(header)} fields, found {len(row)}"
+                row = [""] * len(header)
+            rows.append(row)
+            if len(rows) == batch_size:
+                break
+        if not rows:
+            return
+        cells = list(zip(*rows))
+        columns = {
+            path: _convert_csv_column(cells[index], schema.leaves.get(path))
+            for index, path in selected
+        }
+        yield ColumnBatch(schema, start, len(rows), columns, errors)
+        start += len(rows)
+
+
+def iter_arrow_batches(path, schema, input_format="parquet", overrides=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Reads a Parquet or Arrow IPC (Feather v2) file in column-wise batches.
+
+    Columns stay Arrow arrays, so string checks run as Arrow compute kernels.
+    Null values are treated as absent fields.
+
+    Args:
+        path (str): Path to the input file.
+        schema (ColumnarSchema): Schema the columns are mapped onto.
+        input_format (str): "parquet" or "arrow".
+        overrides (dict): Column name -> dotted field path.
+        batch_size (int): Rows per batch (Parquet only; Arrow files are read
+            in the record batches they were written with).
+
+    Yields:
+        ColumnBatch: Batches in file order.
+    """
+    if pyarrow is None:
+        raise RuntimeError("pyarrow package is not installed. Run 'pip install pyarrow' first.")
+
+    if input_format == "parquet":
+        from pyarrow import parquet
+        source = parquet.ParquetFile(path)
+        mapping = schema.map_columns(source.schema_arrow.names, overrides)
+        # Parquet reads a dotted column name as a nested field, so flat names
+        # with dots are picked from full batches instead
+        selected = None if any("." in name for name in mapping) else list(mapping)
+        batches = source.iter_batches(batch_size=batch_size, columns=selected)
+    elif input_format == "arrow":
+        from pyarrow import ipc
+        source = ipc.open_file(path)
+        mapping = schema.map_columns(source.schema.names, overrides)
+        batches = (source.get_batch(i).select(list(mapping)) for i in range(source.num_record_batches))
+    else:
+        raise ValueError(f"Unknown input format: {input_format!r}")
+
+    start = 1
+    for batch in batches:
+        columns = {}
+        for name, field_path in mapping.items():
+            column = batch.column(name)
+            if pyarrow.types.is_dictionary(column.type):
+                column = column.dictionary_decode()
+            columns[field_path] = column
+        yield ColumnBatch(schema, start, batch.num_rows, columns)
+        start += batch.num_rows
+
+
+def validate_batches(batches, record_type, all_errors=False):
+    """
+    Validates column-wise batches, checking rows one at a time only when needed.
+
+    Rows that pass every column-wise check are valid without being turned
+    into records. Rows that fail one, or that a conditional rule without a
+    column-wise form applies to, are rebuilt as records and validated by
+    the validator of validation.bulk, so their verdicts carry the same
+    messages as the other validation tools.
+
+    Args:
+        batches: An iterable of ColumnBatch.
+        record_type (str): Either "vendor" or "customer".
+        all_errors (bool): List every error of each record, as
+            validation.bulk.collect_records_errors does.
+
+    Yields:
+        dict: One verdict per row, in input order, keyed by "row".
+    """
+    schema_path = get_schema_path(record_type)
+    if all_errors:
+        collect = get_error_collector(record_type)
+    else:
+        validate = get_record_validator(record_type)
+        valid_message = VALID_MESSAGES[record_type]
+
+    for batch in batches:
+        failing, fallback = batch.schema.check(batch)
+        recheck = failing | fallback
+        if metrics.recorder is not None:
+            # Rechecked rows are counted by the registry as they are validated
+            accepted = batch.num_rows - len(recheck | set(batch.errors))
+            metrics.recorder.count_valid(schema_path, accepted)
+        for i in range(batch.num_rows):
+            error = batch.errors.get(i)
+            item = SourceRecord("row", batch.start + i, None, error)
+            if all_errors:
+                if error is not None:
+                    yield make_error_verdict(item, None)
+                else:
+                    yield make_error_verdict(item, collect(batch.record(i)) if i in recheck else [])
+            elif error is not None:
+                yield make_verdict(item, False, error)
+            elif i in recheck:
+                yield make_verdict(item, *validate(batch.record(i)))
+            else:
+                yield make_verdict(item, True, valid_message)
+
+
+def load_columnar_schema(record_type):
+    """Returns the ColumnarSchema for a record type's schema file."""
+    with open(get_schema_path(record_type), 'r', encoding='utf-8') as f:
+        return ColumnarSchema(json.load(f))
+
+
+def _detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    return "csv"
+
+
+def _parse_column_option(value):
+    name, sep, field = value.partition("=")
+    if not sep or not name or not field:
+        raise argparse.ArgumentTypeError(f"Expected COLUMN=FIELD, got {value!r}")
+    return name, field
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Validate vendor or customer records from a CSV, Parquet or Arrow file."
+    )
+    parser.add_argument("record_type", choices=["vendor", "customer"])
+    parser.add_argument("input", help="Input file, or '-' for CSV on standard input")
+    parser.add_argument("-o", "--output", default="-",
+                        help="File for the NDJSON verdicts (default: standard output)")
+    parser.add_argument("--format", dest="input_format", default="auto",
+                        choices=["auto", "csv", "parquet", "arrow"],
+                        help="Input format (default: from the file extension, CSV otherwise)")
+    parser.add_argument("--column", dest="columns", action="append", default=[], type=_parse_column_option,
+                        metavar="COLUMN=FIELD",
+                        help="Map a column to a dotted field path, e.g. BN=vendorIdentificationNumbers.businessNumber")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows checked per batch")
+    parser.add_argument("--all-errors", action="store_true",
+                        help="List every error of each record instead of the first one")
+    parser.add_argument("--report",
+                        help="Write error counts per keyword, field and rule across the file to this JSON file "
+                             "(implies --all-errors)")
+    metrics.add_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    input_format = args.input_format
+    if input_format == "auto":
+        input_format = "csv" if args.input == "-" else _detect_format(args.input)
+    if input_format != "csv" and args.input == "-":
+        parser.error("Parquet and Arrow input must be read from a file")
+    all_errors = args.all_errors or bool(args.report)
+
+    schema = load_columnar_schema(args.record_type)
+    overrides = dict(args.columns)
+    source = None
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    try:
+        with metrics.MetricsSession(args):
+            if input_format == "csv":
+                source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8-sig', newline='')
+                batches = iter_csv_batches(source, schema, overrides, args.batch_size)
+            else:
+                batches = iter_arrow_batches(args.input, schema, input_format, overrides, args.batch_size)
+            report = ErrorReport() if args.report else None
+            total, invalid = write_verdicts(validate_batches(batches, args.record_type, all_errors), out, report)
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{total} records checked, {invalid} invalid", file=sys.stderr)
+    if report is not None:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"Error report written to {args.report}", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
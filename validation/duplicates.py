@@ -0,0 +1,255 @@
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import unicodedata
+
+# Identifier fields checked for each record type: (finding label, path in the record)
+IDENTIFIER_FIELDS = {
+    "vendor": [
+        ("businessNumber", ("vendorIdentificationNumbers", "businessNumber")),
+        ("gstHstNumber", ("vendorIdentificationNumbers", "gstHstNumber")),
+        ("dunsNumber", ("vendorIdentificationNumbers", "dunsNumber")),
+        ("sinNumber", ("vendorIdentificationNumbers", "sinNumber")),
+        ("uniqueIdentifier", ("vendorIdentificationNumbers", "uniqueIdentifier")),
+    ],
+    "customer": [
+        ("customerID", ("customerID",)),
+        ("businessNumber", ("identificationNumbers", "businessNumber")),
+    ],
+}
+
+# Fields compared by their 9-digit Business Number root, so a BN, its
+# program accounts (123456789RC0001) and GST/HST numbers (123456789RT0001)
+# all match the business they belong to
+BN_ROOT_FIELDS = {"businessNumber", "gstHstNumber"}
+
+# Index kind shared by every BN_ROOT_FIELDS field
+_BN_ROOT = "businessNumberRoot"
+
+# Legal-form words dropped when comparing names, so "ABC Company Inc." and
+# "ABC Company" are treated as the same name
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "ltd", "limited", "llc", "llp", "lp", "corp", "corporation",
+    "co", "company", "ltee", "enr", "sarl", "plc",
+}
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+_ID_SEPARATORS = re.compile(r"[\s\-]+")
+_BN_ROOT_PATTERN = re.compile(r"[0-9]{9}")
+
+
+def _get(record, path):
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def normalize_identifier(value):
+    """Uppercases an identifier and removes spaces and hyphens."""
+    if not isinstance(value, str):
+        return None
+    value = _ID_SEPARATORS.sub("", value).upper()
+    return value or None
+
+
+def business_number_root(value):
+    """
+    Returns the 9-digit root of a normalized Business Number, program
+    account or GST/HST number, or None if it does not start with 9 digits.
+    """
+    if value is None or not _BN_ROOT_PATTERN.match(value):
+        return None
+    return value[:9]
+
+
+def normalize_name(value):
+    """
+    Reduces a legal name to a comparison key: accents, case, punctuation and
+    legal-form suffixes such as "Inc." or "Ltd." are removed.
+    """
+    if not isinstance(value, str):
+        return None
+    text = unicodedata.normalize("NFKD", value)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    words = [w for w in _NON_ALPHANUMERIC.split(text) if w]
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def normalize_postal_code(value):
+    """Uppercases a postal or ZIP code and removes spaces and hyphens."""
+    return normalize_identifier(value)
+
+
+class MemoryIndex:
+    """
+    In-memory hash index from a key to the first record that used it.
+    """
+
+    def __init__(self):
+        self._seen = {}
+
+    def first_seen(self, kind, key, position, name, field=None, value=None):
+        """
+        Records (kind, key) for a record and returns the (position, name,
+        field, value) of the first earlier record with the same key, or None.
+        field and value are the identifier the key was derived from.
+        """
+        previous = self._seen.get((kind, key))
+        if previous is None:
+            self._seen[(kind, key)] = (position, name, field, value)
+        return previous
+
+    def close(self):
+        self._seen.clear()
+
+
+class SqliteIndex:
+    """
+    Disk-backed index with the same interface as MemoryIndex, for datasets
+    whose keys do not fit in memory.
+    """
+
+    def __init__(self, path, batch_size=10000):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        # The index describes a single pass, so start from an empty table
+        self._connection.execute("DROP TABLE IF EXISTS seen")
+        self._connection.execute(
+            "CREATE TABLE seen ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, position TEXT NOT NULL, name TEXT, field TEXT, value TEXT,"
+            " PRIMARY KEY (kind, key)) WITHOUT ROWID"
+        )
+        self._batch_size = batch_size
+        self._pending = 0
+
+    def first_seen(self, kind, key, position, name, field=None, value=None):
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO seen (kind, key, position, name, field, value) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, key, json.dumps(position), name, field, value),
+        )
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self._connection.commit()
+            self._pending = 0
+        if cursor.rowcount:
+            return None
+        row = self._connection.execute(
+            "SELECT position, name, field, value FROM seen WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        return json.loads(row[0]), row[1], row[2], row[3]
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+
+def find_duplicates(items, record_type, index=None):
+    """
+    Finds records that share an identifier or look like the same entity, in
+    one streaming pass.
+
+    Each identifier listed in IDENTIFIER_FIELDS is normalized and looked up
+    in the index; a repeat is reported as a "duplicate" when the two records
+    have the same normalized legalName and as a "conflict" when the names
+    differ. Fields in BN_ROOT_FIELDS are looked up by their 9-digit BN root,
+    so 123456789 and 123456789RC0001 match, and a businessNumber can match a
+    gstHstNumber; the finding keeps both full values. Records with no shared
+    identifier but the same normalized legalName and postal code are
+    reported as "near_duplicate".
+
+    Args:
+        items: An iterable of SourceRecord, e.g. from validation.bulk.iter_records.
+        record_type (str): Either "vendor" or "customer".
+        index: A MemoryIndex (default) or SqliteIndex.
+
+    Yields:
+        dict: One finding per repeated key, referring back to the first
+            record that used it: kind, field and value (this record's
+            identifier), record, first, and first_field and first_value
+            (the first record's identifier).
+    """
+    fields = IDENTIFIER_FIELDS[record_type]
+    index = index if index is not None else MemoryIndex()
+
+    for item in items:
+        if item.error is not None or not isinstance(item.record, dict):
+            continue
+        record = item.record
+        position = {item.position_field: item.position}
+        name = normalize_name(record.get("legalName"))
+        matched = False
+        # A record's BN and GST/HST number usually share a root; look it up once
+        looked_up = set()
+
+        for label, path in fields:
+            value = normalize_identifier(_get(record, path))
+            if value is None:
+                continue
+            key = (label, value)
+            if label in BN_ROOT_FIELDS:
+                root = business_number_root(value)
+                if root is not None:
+                    key = (_BN_ROOT, root)
+            if key in looked_up:
+                continue
+            looked_up.add(key)
+            previous = index.first_seen(key[0], key[1], position, name, label, value)
+            if previous is not None:
+                matched = True
+                first_position, first_name, first_field, first_value = previous
+                kind = "duplicate" if name == first_name else "conflict"
+                yield {"kind": kind, "field": label, "value": value,
+                       "record": position, "first": first_position,
+                       "first_field": first_field, "first_value": first_value}
+
+        postal_code = normalize_postal_code(_get(record, ("contactInformation", "address", "postalCode")))
+        if name is not None and postal_code is not None:
+            previous = index.first_seen("name+postalCode", f"{name}|{postal_code}", position, name)
+            if previous is not None and not matched:
+                yield {"kind": "near_duplicate", "field": "legalName+postalCode",
+                       "value": f"{name}|{postal_code}", "record": position, "first": previous[0]}
+
+
+def main(argv=None):
+    from validation.bulk import iter_records
+
+    parser = argparse.ArgumentParser(
+        description="Find duplicate and conflicting vendor or customer records in an NDJSON or JSON-array file."
+    )
+    parser.add_argument("record_type", choices=sorted(IDENTIFIER_FIELDS))
+    parser.add_argument("input", help="Input file, or '-' for standard input")
+    parser.add_argument("-o", "--output", default="-", help="File for the NDJSON findings (default: standard output)")
+    parser.add_argument("--db", help="Keep the index in this SQLite file instead of memory (for very large inputs)")
+    args = parser.parse_args(argv)
+
+    index = SqliteIndex(args.db) if args.db else MemoryIndex()
+    source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    counts = {}
+    try:
+        for finding in find_duplicates(iter_records(source), args.record_type, index):
+            counts[finding["kind"]] = counts.get(finding["kind"], 0) + 1
+            out.write(json.dumps(finding))
+            out.write("\n")
+    finally:
+        index.close()
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())) or "no findings"
+    print(summary, file=sys.stderr)
+    return 1 if counts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
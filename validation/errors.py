@@ -0,0 +1,98 @@
+from collections import Counter
+
+from validation import metrics
+from validation.paths import describe_branch, error_field, field_name, json_pointer
+
+
+def error_details(error, schema):
+    """
+    Converts a jsonschema ValidationError into a plain dict.
+
+    Returns:
+        dict: pointer (JSON pointer to the failing value), field (the field
+            the error is about; see error_field), keyword (the failing
+            schema keyword), message, schema_path (JSON pointer into the
+            schema) and branch (see describe_branch).
+    """
+    return {
+        "pointer": json_pointer(error.absolute_path),
+        "field": error_field(error),
+        "keyword": error.validator,
+        "message": error.message,
+        "schema_path": json_pointer(error.absolute_schema_path),
+        "branch": describe_branch(schema, error.absolute_schema_path),
+    }
+
+
+def collect_errors(compiled, instance):
+    """
+    Returns every validation error for an instance in one pass.
+
+    Args:
+        compiled (CompiledSchema): From validation.registry.get_compiled_schema.
+        instance: The record to validate.
+
+    Returns:
+        list: One dict per error (see error_details); empty if the instance is valid.
+    """
+    if metrics.recorder is not None:
+        return metrics.recorder.time_collect_errors(compiled, _collect_errors, instance)
+    return _collect_errors(compiled, instance)
+
+
+def _collect_errors(compiled, instance):
+    if compiled.fast is not None and compiled.fast.first_error(instance) is None:
+        return []
+    return [error_details(e, compiled.schema) for e in compiled.validator.iter_errors(instance)]
+
+
+class ErrorReport:
+    """
+    Aggregates errors over a batch of records: how many records failed and
+    how often each keyword, field, conditional branch and rule failed.
+    A missing required property counts under the property itself.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.invalid_records = 0
+        self.by_keyword = Counter()
+        self.by_field = Counter()
+        self.by_branch = Counter()
+        self.by_rule = Counter()
+
+    def add(self, errors):
+        """
+        Adds the errors found for one record (an empty list for a valid record).
+        """
+        self.records += 1
+        if not errors:
+            return
+        self.invalid_records += 1
+        for error in errors:
+            field = field_name(error.get("field", error["pointer"])) or "/"
+            self.by_keyword[error["keyword"]] += 1
+            self.by_field[field] += 1
+            if error["branch"]:
+                self.by_branch[error["branch"]] += 1
+            rule = f"{field} {error['keyword']}"
+            if error["branch"]:
+                rule = f"{error['branch']}: {rule}"
+            self.by_rule[rule] += 1
+
+    def to_dict(self, top=None):
+        """
+        Returns the report as a JSON-serializable dict.
+
+        Args:
+            top (int): If set, only the most frequent entries of each count are kept.
+        """
+        return {
+            "records": self.records,
+            "invalid_records": self.invalid_records,
+            "errors": sum(self.by_keyword.values()),
+            "by_keyword": dict(self.by_keyword.most_common(top)),
+            "by_field": dict(self.by_field.most_common(top)),
+            "by_branch": dict(self.by_branch.most_common(top)),
+            "by_rule": dict(self.by_rule.most_common(top)),
+        }
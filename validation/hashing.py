@@ -0,0 +1,11 @@
+import hashlib
+import json
+
+
+def content_hash(record):
+    """
+    Returns a hash of the record's canonical JSON form, so key order and
+    whitespace do not change it.
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,217 @@
+import sqlite3
+
+from validation.bulk import get_fast_validator, get_record_validator, get_schema_path
+from validation.hashing import content_hash
+from validation.registry import get_compiled_schema
+
+# Fields tried in order to find a record's stable key. Records with none of
+# them are keyed by their content hash.
+DEFAULT_KEY_FIELDS = {
+    "vendor": [
+        ("vendorIdentificationNumbers", "supplierNumber"),
+        ("vendorIdentificationNumbers", "businessNumber"),
+        ("vendorIdentificationNumbers", "uniqueIdentifier"),
+    ],
+    "customer": [
+        ("customerID",),
+    ],
+}
+
+# Path of the optional last-modified timestamp used as a pre-filter
+LAST_MODIFIED_PATH = ("accountDetails", "lastModified")
+
+# Cache writes and LRU updates are flushed to disk in batches of this size
+FLUSH_EVERY = 5000
+
+
+def _get(record, path):
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def default_record_key(record, record_type):
+    """
+    Returns a stable key for a record from DEFAULT_KEY_FIELDS, or None.
+    """
+    for path in DEFAULT_KEY_FIELDS[record_type]:
+        value = _get(record, path)
+        if isinstance(value, str) and value:
+            return f"{path[-1]}:{value}"
+    return None
+
+
+class IncrementalValidator:
+    """
+    Validates records, reusing results from earlier runs for records that
+    have not changed.
+
+    Results are stored in a SQLite file keyed by (record type, record key)
+    together with the record's content hash and the schema hash. A cached
+    result is reused only when both hashes match, so any change to the
+    record or the schema causes revalidation. When the schema file changes,
+    every cached result for that record type is dropped.
+
+    Args:
+        cache_path (str): SQLite file holding the cache; created if missing.
+        record_type (str): Either "vendor" or "customer".
+        max_entries (int): If set, least recently used results beyond this
+            count are evicted when the validator is closed.
+        trust_last_modified (bool): If True, a record whose
+            accountDetails.lastModified equals the cached value is treated
+            as unchanged without hashing it.
+        key_function (callable): Returns the key for a record; defaults to
+            default_record_key.
+    """
+
+    def __init__(self, cache_path, record_type, max_entries=None, trust_last_modified=False, key_function=None):
+        self.record_type = record_type
+        self.max_entries = max_entries
+        self.trust_last_modified = trust_last_modified
+        self.key_function = key_function or (lambda record: default_record_key(record, record_type))
+        self.hits = 0
+        self.misses = 0
+
+        self._validate = get_record_validator(record_type)
+        self._schema_path = get_schema_path(record_type)
+        self._fast_validator = get_fast_validator(record_type)
+        self._connection = sqlite3.connect(cache_path)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " record_type TEXT NOT NULL, record_key TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL, schema_hash TEXT NOT NULL, last_modified TEXT,"
+            " valid INTEGER NOT NULL, message TEXT NOT NULL, used INTEGER NOT NULL,"
+            " PRIMARY KEY (record_type, record_key));"
+            "CREATE INDEX IF NOT EXISTS results_used ON results (record_type, used);"
+            "CREATE TABLE IF NOT EXISTS schemas (record_type TEXT PRIMARY KEY, schema_hash TEXT NOT NULL);"
+        )
+        row = self._connection.execute(
+            "SELECT MAX(used) FROM results WHERE record_type = ?", (record_type,)
+        ).fetchone()
+        self._clock = row[0] or 0
+        self._writes = []
+        self._touched = []
+        self._schema_hash = None
+        self._check_schema()
+
+    def _check_schema(self):
+        # Drops cached results made with a different schema
+        schema_hash = get_compiled_schema(self._schema_path, self._fast_validator).sha256
+        if schema_hash == self._schema_hash:
+            return schema_hash
+        self._flush()
+        row = self._connection.execute(
+            "SELECT schema_hash FROM schemas WHERE record_type = ?", (self.record_type,)
+        ).fetchone()
+        if row is None or row[0] != schema_hash:
+            self._connection.execute("DELETE FROM results WHERE record_type = ?", (self.record_type,))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO schemas (record_type, schema_hash) VALUES (?, ?)",
+                (self.record_type, schema_hash),
+            )
+            self._connection.commit()
+        self._schema_hash = schema_hash
+        return schema_hash
+
+    def validate(self, record):
+        """
+        Validates a record, or returns the cached result if it is unchanged.
+
+        Args:
+            record (dict): A vendor or customer record.
+
+        Returns:
+            tuple: (bool, str) as returned by validate_vendor or validate_customer.
+        """
+        schema_hash = self._check_schema()
+        self._clock += 1
+        key = self.key_function(record) if isinstance(record, dict) else None
+        last_modified = _get(record, LAST_MODIFIED_PATH) if self.trust_last_modified else None
+        if not isinstance(last_modified, str):
+            last_modified = None
+
+        cached = None
+        if key is not None:
+            cached = self._connection.execute(
+                "SELECT content_hash, schema_hash, last_modified, valid, message"
+                " FROM results WHERE record_type = ? AND record_key = ?",
+                (self.record_type, key),
+            ).fetchone()
+
+        if cached is not None and cached[1] == schema_hash:
+            if last_modified is not None and cached[2] == last_modified:
+                return self._hit(key, cached)
+            digest = content_hash(record)
+            if cached[0] == digest:
+                return self._hit(key, cached)
+        else:
+            digest = content_hash(record)
+
+        if key is None:
+            key = f"#{digest}"
+            cached = self._connection.execute(
+                "SELECT content_hash, schema_hash, last_modified, valid, message"
+                " FROM results WHERE record_type = ? AND record_key = ?",
+                (self.record_type, key),
+            ).fetchone()
+            if cached is not None and cached[1] == schema_hash:
+                return self._hit(key, cached)
+
+        self.misses += 1
+        is_valid, message = self._validate(record)
+        self._writes.append(
+            (self.record_type, key, digest, schema_hash, last_modified, int(is_valid), message, self._clock)
+        )
+        if len(self._writes) >= FLUSH_EVERY:
+            self._flush()
+        return is_valid, message
+
+    def _hit(self, key, cached):
+        self.hits += 1
+        self._touched.append((self._clock, self.record_type, key))
+        if len(self._touched) >= FLUSH_EVERY:
+            self._flush()
+        return bool(cached[3]), cached[4]
+
+    def _flush(self):
+        if self._writes:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results"
+                " (record_type, record_key, content_hash, schema_hash, last_modified, valid, message, used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._writes,
+            )
+            self._writes = []
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE results SET used = ? WHERE record_type = ? AND record_key = ?", self._touched
+            )
+            self._touched = []
+        self._connection.commit()
+
+    def evict(self):
+        """Removes least recently used results beyond max_entries."""
+        if not self.max_entries:
+            return
+        self._flush()
+        self._connection.execute(
+            "DELETE FROM results WHERE record_type = ? AND used <= ("
+            " SELECT used FROM results WHERE record_type = ? ORDER BY used DESC LIMIT 1 OFFSET ?)",
+            (self.record_type, self.record_type, self.max_entries),
+        )
+        self._connection.commit()
+
+    def close(self):
+        """Writes pending results, applies eviction and closes the cache file."""
+        self.evict()
+        self._flush()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
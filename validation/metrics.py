@@ -0,0 +1,640 @@
+import bisect
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from validation import hashing, paths
+
+# Upper bounds (seconds) of the per-record timing histogram buckets
+RECORD_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05,
+)
+
+# Upper bounds (seconds) of the per-rule timing histogram buckets
+RULE_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.001, 0.005,
+)
+
+# The active ValidationMetrics, or None when instrumentation is off.
+# CompiledSchema.best_error and collect_errors only check this name, so
+# validation pays a single global lookup while it is off.
+recorder = None
+
+
+def enable(metrics=None):
+    """
+    Starts recording validation metrics in this process.
+
+    Args:
+        metrics (ValidationMetrics): The collector to record into (default:
+            a new one with default options).
+
+    Returns:
+        ValidationMetrics: The active collector.
+    """
+    global recorder
+    recorder = metrics if metrics is not None else ValidationMetrics()
+    return recorder
+
+
+def disable():
+    """Stops recording and returns the collector that was active, if any."""
+    global recorder
+    previous, recorder = recorder, None
+    return previous
+
+
+def schema_name(schema_path):
+    """Returns the label used for a schema in metrics, e.g. "vendor_schema"."""
+    return os.path.splitext(os.path.basename(schema_path))[0]
+
+
+class Histogram:
+    """
+    Counts observations in fixed buckets, as a Prometheus histogram does.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.count += other.count
+
+    def cumulative(self):
+        """Returns (upper bound, count at or below it) pairs, ending with +Inf."""
+        return list(zip(self.bounds + (float("inf"),), itertools.accumulate(self.counts)))
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": {_format_bound(bound): n for bound, n in self.cumulative()},
+        }
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _walk_patterns(node, schema_path, path, found):
+    # Collects (schema path, instance path, compiled pattern) for every
+    # pattern that applies at a fixed location; "*" in a path stands for
+    # every item of an array.
+    if not isinstance(node, dict):
+        return
+    if isinstance(node.get("pattern"), str):
+        found.append((schema_path + ["pattern"], path, re.compile(node["pattern"])))
+    for name, subschema in node.get("properties", {}).items():
+        _walk_patterns(subschema, schema_path + ["properties", name], path + (name,), found)
+    if isinstance(node.get("items"), dict):
+        _walk_patterns(node["items"], schema_path + ["items"], path + ("*",), found)
+    for i, entry in enumerate(node.get("allOf", [])):
+        for key in ("then", "else"):
+            if key in entry:
+                _walk_patterns(entry[key], schema_path + ["allOf", i, key], path, found)
+
+
+def _values_at(instance, path):
+    values = [instance]
+    for key in path:
+        if key == "*":
+            values = [item for value in values if isinstance(value, list) for item in value]
+        else:
+            values = [value[key] for value in values if isinstance(value, dict) and key in value]
+    return values
+
+
+class RuleProfiler:
+    """
+    Times the rules of one schema separately on a record: each top-level
+    property, each allOf entry and each regular expression.
+
+    When the schema has a generated validator (see validation/codegen.py),
+    its own check functions are timed, and a dispatched allOf branch is only
+    timed on records whose dispatch key selects it, as in production.
+    Otherwise the rules are timed with jsonschema, which evaluates every
+    allOf entry including its 'if'; validator records which path was timed.
+
+    Rule names are "properties/<name>", "allOf/<n> (<branch>)" with the
+    values the entry's 'if' tests (see validation.paths.describe_branch),
+    and "pattern <schema pointer>".
+
+    Attributes:
+        validator (str): "generated" or "jsonschema".
+    """
+
+    def __init__(self, compiled):
+        schema = compiled.schema
+        generated = getattr(compiled.fast, "RULES", None)
+        # (name, instance path, check, selector, branch check): a rule with a
+        # selector only runs when selector(instance) returns branch check
+        self.rules = []
+        # allOf index -> (selector, check) of each dispatched branch
+        dispatched = {}
+        if generated is not None:
+            self.validator = "generated"
+            for name, path, check, selector in generated:
+                self.rules.append((self._branch_name(schema, name), path, check, selector, check))
+                if selector is not None:
+                    dispatched[int(name.split("/")[1])] = (selector, check)
+        else:
+            self.validator = "jsonschema"
+            validator = compiled.validator
+            for name, subschema in schema.get("properties", {}).items():
+                check = validator.evolve(schema=subschema).is_valid
+                self.rules.append((f"properties/{name}", (name,), check, None, None))
+            for i, entry in enumerate(schema.get("allOf", [])):
+                check = validator.evolve(schema=entry).is_valid
+                self.rules.append((self._branch_name(schema, f"allOf/{i}"), (), check, None, None))
+        patterns = []
+        _walk_patterns(schema, [], (), patterns)
+        for schema_path, path, pattern in patterns:
+            # A pattern inside a dispatched branch is only timed when the branch applies
+            selector, branch_check = None, None
+            if schema_path[0] == "allOf":
+                selector, branch_check = dispatched.get(schema_path[1], (None, None))
+            name = f"pattern {paths.json_pointer(schema_path)}"
+            self.rules.append((name, path, _string_search(pattern), selector, branch_check))
+
+    @staticmethod
+    def _branch_name(schema, name):
+        # "allOf/2" -> "allOf/2 (Corporation/Partnership + CA)" for conditional entries
+        if not name.startswith("allOf/"):
+            return name
+        i = int(name.split("/")[1])
+        if "if" not in schema["allOf"][i]:
+            return name
+        branch = paths.describe_branch(schema, ["allOf", i, "then"])
+        return f"{name} ({branch})" if branch else name
+
+    def run(self, instance):
+        """Yields (rule name, seconds) for each rule that applies to the instance."""
+        clock = time.perf_counter
+        selected = {}
+        for name, path, check, selector, branch_check in self.rules:
+            if selector is not None:
+                if selector not in selected:
+                    selected[selector] = selector(instance)
+                if branch_check not in selected[selector]:
+                    continue
+            for value in _values_at(instance, path):
+                start = clock()
+                check(value)
+                yield name, clock() - start
+
+
+def _string_search(pattern):
+    search = pattern.search
+
+    def check(value):
+        return not isinstance(value, str) or search(value) is not None
+    return check
+
+
+class ValidationMetrics:
+    """
+    Counters, timing histograms and slow-record samples for validation.
+
+    Every record validated through the registry (validate_vendor,
+    validate_customer, the collect-all-errors functions and the batch tools
+    built on them) is timed and counted per schema while this collector is
+    enabled. Invalid records also count their errors per keyword and field,
+    and per allOf branch for conditional rules. Each rule_sample_every-th
+    record is additionally validated rule by rule (see RuleProfiler) to
+    time each rule separately.
+
+    Args:
+        rule_sample_every (int): Time the rules of every Nth record; 0 turns
+            per-rule timing off.
+        slow_threshold (float): Records taking at least this many seconds
+            are candidates for the slow-record samples; None turns sampling off.
+        slow_samples (int): Number of slowest records kept.
+        include_records (bool): Keep the slow records themselves in the
+            samples. They may contain personal information, so by default
+            only their content hash is kept.
+    """
+
+    def __init__(self, rule_sample_every=100, slow_threshold=0.001, slow_samples=20, include_records=False):
+        self.rule_sample_every = rule_sample_every
+        self.slow_threshold = slow_threshold
+        self.slow_samples = slow_samples
+        self.include_records = include_records
+        self.started = time.time()
+        self.records = Counter()
+        self.errors = Counter()
+        self.branch_errors = Counter()
+        self.timings = {}
+        self.rule_timings = {}
+        self.slow = []
+        self._seen = 0
+        self._profilers = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def options(self):
+        """Returns the constructor arguments, to build a like collector elsewhere."""
+        return {
+            "rule_sample_every": self.rule_sample_every,
+            "slow_threshold": self.slow_threshold,
+            "slow_samples": self.slow_samples,
+            "include_records": self.include_records,
+        }
+
+    def time_best_error(self, compiled, best_error, instance):
+        """Calls best_error(instance) and records it. Used by CompiledSchema.best_error."""
+        start = time.perf_counter()
+        error = best_error(instance)
+        seconds = time.perf_counter() - start
+        if error is None:
+            found = []
+        else:
+            found = [(
+                error.validator,
+                paths.field_name(paths.error_field(error)) or "/",
+                paths.describe_branch(compiled.schema, error.absolute_schema_path),
+            )]
+        self._record(compiled, instance, seconds, found)
+        return error
+
+    def time_collect_errors(self, compiled, collect, instance):
+        """Calls collect(compiled, instance) and records it. Used by collect_errors."""
+        start = time.perf_counter()
+        details = collect(compiled, instance)
+        seconds = time.perf_counter() - start
+        found = [(d["keyword"], paths.field_name(d.get("field", d["pointer"])) or "/", d["branch"]) for d in details]
+        self._record(compiled, instance, seconds, found)
+        return details
+
+    def count_valid(self, schema_path, count):
+        """Counts records found valid without going through the registry."""
+        with self._lock:
+            self.records[(schema_name(schema_path), "valid")] += count
+
+    def _record(self, compiled, instance, seconds, found):
+        name = self._names.get(compiled.path)
+        if name is None:
+            name = self._names[compiled.path] = schema_name(compiled.path)
+        with self._lock:
+            self._seen += 1
+            seen = self._seen
+            histogram = self.timings.get(name)
+            if histogram is None:
+                histogram = self.timings[name] = Histogram(RECORD_BUCKETS)
+            histogram.observe(seconds)
+            self.records[(name, "invalid" if found else "valid")] += 1
+            for keyword, field, branch in found:
+                self.errors[(name, keyword, field)] += 1
+                if branch:
+                    self.branch_errors[(name, branch)] += 1
+            keep = (self.slow_threshold is not None and seconds >= self.slow_threshold
+                    and (len(self.slow) < self.slow_samples or seconds > self.slow[0][0]))
+
+        if keep:
+            self._sample_slow(name, instance, seconds, found, seen)
+        if self.rule_sample_every and seen % self.rule_sample_every == 0:
+            self._time_rules(compiled, name, instance)
+
+    def _sample_slow(self, name, instance, seconds, found, seen):
+        sample = {
+            "schema": name,
+            "seconds": seconds,
+            "valid": not found,
+            "errors": [{"keyword": k, "field": f, "branch": b} for k, f, b in found[:5]],
+            "content_hash": hashing.content_hash(instance),
+        }
+        if self.include_records:
+            sample["record"] = instance
+        with self._lock:
+            entry = (seconds, seen, sample)
+            if len(self.slow) < self.slow_samples:
+                heapq.heappush(self.slow, entry)
+            elif self.slow and seconds > self.slow[0][0]:
+                heapq.heapreplace(self.slow, entry)
+
+    def _time_rules(self, compiled, name, instance):
+        # A generated validator may be attached to the schema after it was first used
+        key = (compiled.path, compiled.sha256, compiled.fast is not None)
+        profiler = self._profilers.get(key)
+        if profiler is None:
+            profiler = self._profilers[key] = RuleProfiler(compiled)
+        timings = list(profiler.run(instance))
+        with self._lock:
+            for rule, seconds in timings:
+                histogram = self.rule_timings.get((name, profiler.validator, rule))
+                if histogram is None:
+                    histogram = self.rule_timings[(name, profiler.validator, rule)] = Histogram(RULE_BUCKETS)
+                histogram.observe(seconds)
+
+    def take(self):
+        """
+        Returns a collector holding everything recorded so far and empties
+        this one, keeping its options and rule profilers.
+        """
+        taken = ValidationMetrics(**self.options())
+        with self._lock:
+            for attribute in ("records", "errors", "branch_errors", "timings", "rule_timings", "slow"):
+                setattr(taken, attribute, getattr(self, attribute))
+            self.records, self.errors, self.branch_errors = Counter(), Counter(), Counter()
+            self.timings, self.rule_timings, self.slow = {}, {}, []
+        return taken
+
+    def merge(self, other):
+        """Adds the counts and samples of another collector, e.g. from a worker process."""
+        with self._lock:
+            self.records.update(other.records)
+            self.errors.update(other.errors)
+            self.branch_errors.update(other.branch_errors)
+            for target, source in ((self.timings, other.timings), (self.rule_timings, other.rule_timings)):
+                for key, histogram in source.items():
+                    if key not in target:
+                        target[key] = Histogram(histogram.bounds)
+                    target[key].merge(histogram)
+            for seconds, _, sample in other.slow:
+                self._seen += 1
+                entry = (seconds, self._seen, sample)
+                if len(self.slow) < self.slow_samples:
+                    heapq.heappush(self.slow, entry)
+                elif seconds > self.slow[0][0]:
+                    heapq.heapreplace(self.slow, entry)
+
+    def __getstate__(self):
+        # Locks and rule profilers stay in the process that made them
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["_profilers"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Returns the current metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "uptime_seconds": round(time.time() - self.started, 3),
+                "records": _nest(self.records),
+                "errors": _nest(self.errors),
+                "branch_errors": _nest(self.branch_errors),
+                "record_seconds": {name: h.to_dict() for name, h in self.timings.items()},
+                "rule_seconds": _nest({key: h.to_dict() for key, h in self.rule_timings.items()}),
+                "slow_records": [sample for _, _, sample in sorted(self.slow, reverse=True)],
+            }
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            _counter(lines, "validation_records_total", "Records validated, by schema and result.",
+                     ("schema", "result"), self.records)
+            _counter(lines, "validation_errors_total", "Validation errors, by schema, keyword and field.",
+                     ("schema", "keyword", "field"), self.errors)
+            _counter(lines, "validation_branch_errors_total", "Validation errors raised by conditional allOf rules.",
+                     ("schema", "branch"), self.branch_errors)
+            _histogram(lines, "validation_record_seconds", "Time to validate one record.",
+                       ("schema",), {(name,): h for name, h in self.timings.items()})
+            _histogram(lines, "validation_rule_seconds",
+                       "Time spent in one rule, on sampled records, by the generated or jsonschema validator.",
+                       ("schema", "validator", "rule"), self.rule_timings)
+            return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the metrics to a file: Prometheus text for paths ending in
+        .prom or .txt, JSON otherwise. The file is replaced atomically, so
+        readers such as a Prometheus textfile collector never see it half written.
+        """
+        if path.endswith((".prom", ".txt")):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2)
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+
+def _nest(counts):
+    # {("a", "b"): n} -> {"a": {"b": n}}
+    nested = {}
+    for key, value in counts.items():
+        target = nested
+        for part in key[:-1]:
+            target = target.setdefault(part, {})
+        target[key[-1]] = value
+    return nested
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _counter(lines, metric, help_text, label_names, counts):
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} counter")
+    for key, value in sorted(counts.items()):
+        lines.append(f"{metric}{_labels(label_names, key)} {value}")
+
+
+def _histogram(lines, metric, help_text, label_names, histograms):
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} histogram")
+    for key, histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            le = f'le="{_format_bound(bound)}"'
+            lines.append(f"{metric}_bucket{_labels(label_names, key, le)} {count}")
+        lines.append(f"{metric}_sum{_labels(label_names, key)} {histogram.total!r}")
+        lines.append(f"{metric}_count{_labels(label_names, key)} {histogram.count}")
+
+
+class SnapshotWriter:
+    """
+    Rewrites a metrics file every interval seconds from a background thread,
+    and once more when stopped.
+
+    Args:
+        metrics (ValidationMetrics): The collector to write.
+        path (str): Output file; see ValidationMetrics.write for the format.
+        interval (float): Seconds between writes.
+    """
+
+    def __init__(self, metrics, path, interval):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.metrics.write(self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.metrics.write(self.path)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for one thread.
+
+    A background thread records the target thread's call stack every
+    interval seconds. Unlike cProfile, the profiled code is not slowed down
+    per call, so it can be switched on for a production run. Results are
+    collapsed stacks ("outer;inner;innermost count" per line), the input
+    format of flamegraph.pl and speedscope.
+
+    Args:
+        interval (float): Seconds between samples.
+        thread_id (int): Thread to sample (default: the thread that calls start).
+    """
+
+    def __init__(self, interval=0.001, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                stack.append(label)
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Returns the samples as collapsed stack lines, most frequent first."""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def top_functions(self, n=20):
+        """Returns the n functions most often on top of the stack, with their sample counts."""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+
+
+def add_arguments(parser):
+    """Adds the metrics and profiling options to a command-line parser."""
+    group = parser.add_argument_group("metrics and profiling")
+    group.add_argument("--metrics",
+                       help="Write validation metrics to this file: Prometheus text for .prom/.txt, JSON otherwise")
+    group.add_argument("--metrics-interval", type=float, default=None,
+                       help="Also rewrite the --metrics file every this many seconds while running")
+    group.add_argument("--rule-sample-every", type=int, default=100,
+                       help="Time each schema rule on every Nth record; 0 turns it off (default: 100)")
+    group.add_argument("--slow-ms", type=float, default=1.0,
+                       help="Sample records that take at least this many milliseconds (default: 1)")
+    group.add_argument("--profile",
+                       help="Run a sampling profiler on the main thread and write collapsed stacks to this file")
+    group.add_argument("--profile-interval-ms", type=float, default=1.0,
+                       help="Milliseconds between profiler samples (default: 1)")
+
+
+class MetricsSession:
+    """
+    Turns on the metrics and profiler requested on the command line (see
+    add_arguments) for the duration of a with block, and writes their
+    results at the end.
+
+    Attributes:
+        metrics (ValidationMetrics): The active collector, or None if
+            --metrics was not given.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.metrics = None
+        self._writer = None
+        self._profiler = None
+
+    def __enter__(self):
+        args = self.args
+        if args.metrics:
+            self.metrics = enable(ValidationMetrics(
+                rule_sample_every=args.rule_sample_every,
+                slow_threshold=args.slow_ms / 1000,
+            ))
+            if args.metrics_interval:
+                self._writer = SnapshotWriter(self.metrics, args.metrics, args.metrics_interval).start()
+        if args.profile:
+            self._profiler = SamplingProfiler(args.profile_interval_ms / 1000).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler.write(self.args.profile)
+            print(f"Profile ({self._profiler.samples} samples) written to {self.args.profile}", file=sys.stderr)
+        if self.metrics is not None:
+            disable()
+            if self._writer is not None:
+                self._writer.stop()
+            else:
+                self.metrics.write(self.args.metrics)
+            print(f"Metrics written to {self.args.metrics}", file=sys.stderr)
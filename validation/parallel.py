@@ -0,0 +1,221 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from validation import metrics
+from validation.bulk import (
+    SourceRecord,
+    decode_line,
+    detect_input_format,
+    get_error_collector,
+    get_record_validator,
+    iter_json_array,
+    iter_ndjson_lines,
+    make_error_verdict,
+    make_verdict,
+)
+
+# Records or NDJSON lines sent to a worker per task
+DEFAULT_CHUNK_SIZE = 500
+
+# Set in each worker process by _init_worker
+_worker_validate = None
+
+
+def _init_worker(record_type, all_errors=False, metrics_options=None):
+    """
+    Prepares a worker process: imports the validator for the record type and
+    compiles its schema once, so tasks only carry records. With
+    metrics_options, the worker records validation metrics (see
+    validation.metrics.ValidationMetrics) and returns them with each chunk.
+    """
+    global _worker_validate
+    # A forked worker inherits the parent's collector; start from a clean one
+    if metrics_options is None:
+        metrics.disable()
+    else:
+        metrics.enable(metrics.ValidationMetrics(**metrics_options))
+    if all_errors:
+        _worker_validate = get_error_collector(record_type)
+    else:
+        _worker_validate = get_record_validator(record_type)
+    # Validating a throwaway record loads the schema into this process's registry
+    _worker_validate({})
+    if metrics.recorder is not None:
+        metrics.recorder.take()
+
+
+def _take_metrics():
+    return metrics.recorder.take() if metrics.recorder is not None else None
+
+
+def _validate_chunk(records):
+    results = [_worker_validate(record) for record in records]
+    return results, _take_metrics()
+
+
+def _validate_lines(lines):
+    # Decoding happens here rather than in the parent, which only splits the
+    # input into lines; a line that does not decode returns its error instead
+    results = []
+    for line in lines:
+        record, error = decode_line(line)
+        results.append((error, _worker_validate(record) if error is None else None))
+    return results, _take_metrics()
+
+
+def _verdict(item, result, all_errors):
+    if all_errors:
+        return make_error_verdict(item, result if item.error is None else None)
+    if item.error is not None:
+        return make_verdict(item, False, item.error)
+    is_valid, message = result
+    return make_verdict(item, is_valid, message)
+
+
+def _run_chunks(tasks, record_type, workers, all_errors, collector):
+    # Submits (chunk, function, argument) tasks with a bounded number in
+    # flight and yields (chunk, results) in submission order
+    workers = workers or os.cpu_count() or 1
+    tasks = iter(tasks)
+    pending = deque()
+    max_pending = workers * 2
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(record_type, all_errors, collector.options() if collector is not None else None),
+    ) as executor:
+        while True:
+            while len(pending) < max_pending:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                chunk, function, argument = task
+                pending.append((chunk, executor.submit(function, argument)))
+            if not pending:
+                break
+
+            chunk, future = pending.popleft()
+            results, collected = future.result()
+            if collected is not None:
+                collector.merge(collected)
+            yield chunk, results
+
+
+def validate_records_parallel(items, record_type, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, all_errors=False,
+                              collector=None):
+    """
+    Validates a stream of records on a pool of worker processes.
+
+    Records are grouped into chunks and each chunk is validated by one worker.
+    Only a bounded number of chunks is in flight at a time, so large inputs
+    are streamed rather than queued up in memory. Verdicts are yielded in
+    input order.
+
+    The records are decoded in this process and sent to the workers as
+    objects; for NDJSON input, validate_stream_parallel leaves decoding to
+    the workers as well.
+
+    Args:
+        items: An iterable of SourceRecord, e.g. from validation.bulk.iter_records.
+        record_type (str): Either "vendor" or "customer".
+        workers (int): Number of worker processes (default: CPU count).
+        chunk_size (int): Records per task.
+        all_errors (bool): List every error of each record, as
+            validation.bulk.collect_records_errors does.
+        collector (ValidationMetrics): If given, workers record validation
+            metrics with the same options and they are merged into it.
+
+    Yields:
+        dict: One verdict per record, in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    def tasks():
+        items_iter = iter(items)
+        while True:
+            chunk = list(itertools.islice(items_iter, chunk_size))
+            if not chunk:
+                return
+            yield chunk, _validate_chunk, [item.record for item in chunk if item.error is None]
+
+    for chunk, results in _run_chunks(tasks(), record_type, workers, all_errors, collector):
+        results = iter(results)
+        for item in chunk:
+            yield _verdict(item, next(results) if item.error is None else None, all_errors)
+
+
+def validate_lines_parallel(lines, record_type, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, all_errors=False,
+                            collector=None):
+    """
+    Decodes and validates NDJSON lines on a pool of worker processes.
+
+    Only the line text is sent to the workers, which decode it themselves,
+    so this process does no per-record work beyond splitting the input and
+    writing verdicts. Line numbers stay in this process and each verdict is
+    tagged with its line, in input order.
+
+    Args:
+        lines: An iterable of (line number, line text), e.g. from
+            validation.bulk.iter_ndjson_lines.
+        record_type (str): Either "vendor" or "customer".
+        workers (int): Number of worker processes (default: CPU count).
+        chunk_size (int): Lines per task.
+        all_errors (bool): List every error of each record.
+        collector (ValidationMetrics): If given, worker metrics are merged into it.
+
+    Yields:
+        dict: One verdict per non-blank line, in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    def tasks():
+        lines_iter = iter(lines)
+        while True:
+            chunk = list(itertools.islice(lines_iter, chunk_size))
+            if not chunk:
+                return
+            yield [line_number for line_number, _ in chunk], _validate_lines, [line for _, line in chunk]
+
+    for line_numbers, results in _run_chunks(tasks(), record_type, workers, all_errors, collector):
+        for line_number, (error, result) in zip(line_numbers, results):
+            yield _verdict(SourceRecord("line", line_number, None, error), result, all_errors)
+
+
+def validate_stream_parallel(stream, record_type, input_format="auto", workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                             all_errors=False, collector=None):
+    """
+    Validates every record of an NDJSON or JSON-array stream on a pool of
+    worker processes.
+
+    NDJSON lines are decoded by the workers (see validate_lines_parallel).
+    Elements of a JSON array can only be found by decoding the array, so
+    they are decoded here and sent as records (see validate_records_parallel).
+
+    Args:
+        stream: A text stream.
+        record_type (str): Either "vendor" or "customer".
+        input_format (str): "ndjson", "array" or "auto".
+        workers (int): Number of worker processes (default: CPU count).
+        chunk_size (int): Records per task.
+        all_errors (bool): List every error of each record.
+        collector (ValidationMetrics): If given, worker metrics are merged into it.
+
+    Yields:
+        dict: One verdict per record, in input order.
+    """
+    input_format, first_chunk = detect_input_format(stream, input_format)
+    if input_format == "ndjson":
+        yield from validate_lines_parallel(
+            iter_ndjson_lines(stream, first_chunk), record_type, workers, chunk_size, all_errors, collector
+        )
+    elif input_format == "array":
+        yield from validate_records_parallel(
+            iter_json_array(stream, first_chunk), record_type, workers, chunk_size, all_errors, collector
+        )
+    else:
+        raise ValueError(f"Unknown input format: {input_format!r}")
@@ -0,0 +1,71 @@
+def json_pointer(path):
+    """
+    Returns the JSON pointer (RFC 6901) for a sequence of keys and indexes.
+    """
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def describe_branch(schema, schema_path):
+    """
+    Describes the conditional allOf branch an error came from.
+
+    For an error raised under allOf/<n>/then, returns the values the branch's
+    'if' tests, e.g. "Corporation/Partnership + CA" for the rule that Canadian
+    corporations need a business number. Returns None for errors outside a
+    conditional branch.
+
+    Args:
+        schema (dict): The root schema.
+        schema_path: The error's schema path (jsonschema's error.schema_path).
+    """
+    path = list(schema_path)
+    for i in range(len(path) - 2):
+        if path[i] == "allOf" and path[i + 2] in ("then", "else"):
+            node = schema
+            for part in path[:i + 2]:
+                node = node[part]
+            condition = node.get("if", {})
+            values = []
+            for prop, prop_schema in condition.get("properties", {}).items():
+                if isinstance(prop_schema, dict) and "enum" in prop_schema:
+                    values.append("/".join(str(v) for v in prop_schema["enum"]))
+                else:
+                    values.append(prop)
+            description = " + ".join(values) or json_pointer(path[:i + 2])
+            return description if path[i + 2] == "then" else f"not ({description})"
+    return None
+
+
+def missing_property(error):
+    """
+    Returns the property a 'required' error reports as missing, or None for
+    other errors.
+    """
+    if error.validator != "required" or not isinstance(error.instance, dict):
+        return None
+    missing = [prop for prop in error.validator_value if prop not in error.instance]
+    for prop in missing:
+        if error.message == f"{prop!r} is a required property":
+            return prop
+    return missing[0] if missing else None
+
+
+def error_field(error):
+    """
+    Returns the JSON pointer of the field a jsonschema ValidationError is
+    about. This is the failing value, except for 'required' errors, which
+    fail on the parent object and are about the missing property under it.
+    """
+    path = list(error.absolute_path)
+    prop = missing_property(error)
+    if prop is not None:
+        path.append(prop)
+    return json_pointer(path)
+
+
+def field_name(pointer):
+    """
+    Returns a pointer with array indexes replaced by '*', so errors in
+    different items of the same array are counted together.
+    """
+    return "/".join("*" if part.isdigit() else part for part in pointer.split("/"))
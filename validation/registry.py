@@ -0,0 +1,188 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+
+from validation import metrics
+
+
+def jsonschema_installed():
+    """Returns whether jsonschema can be imported, without importing it."""
+    return importlib.util.find_spec("jsonschema") is not None
+
+
+def load_jsonschema():
+    """
+    Imports jsonschema on first use.
+
+    Importing jsonschema takes far longer than validating a record, so it is
+    kept off the import path and only loaded to explain invalid records or
+    to compile a schema that has no generated validator.
+
+    Raises:
+        RuntimeError: If jsonschema is not installed.
+    """
+    try:
+        import jsonschema
+    except ImportError:
+        raise RuntimeError("jsonschema package is not installed. Run 'pip install jsonschema' first.") from None
+    return jsonschema
+
+
+class CompiledSchema:
+    """
+    A schema loaded from disk together with its ready-to-use validator.
+
+    Attributes:
+        path (str): Absolute path of the schema file.
+        sha256 (str): Hex digest of the schema file contents.
+        schema (dict): The parsed schema.
+        validator: A jsonschema validator instance built for the schema,
+            created on first use when a generated validator is attached.
+        fast: The generated validator module for this exact schema (see
+            validation/codegen.py), or None to always use jsonschema.
+    """
+
+    def __init__(self, path, sha256, stat_key, schema, validator=None, fast=None):
+        self.path = path
+        self.sha256 = sha256
+        self.stat_key = stat_key
+        self.schema = schema
+        self._validator = validator
+        self.fast = fast
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            jsonschema = load_jsonschema()
+            self._validator = jsonschema.validators.validator_for(self.schema)(self.schema)
+        return self._validator
+
+    def best_error(self, instance):
+        """
+        Returns the error jsonschema.validate would raise for the instance,
+        or None if the instance is valid.
+
+        Valid instances are accepted by the generated validator when one is
+        attached; jsonschema only runs to explain invalid ones.
+        """
+        if metrics.recorder is not None:
+            return metrics.recorder.time_best_error(self, self._best_error, instance)
+        return self._best_error(instance)
+
+    def _best_error(self, instance):
+        if self.fast is not None and self.fast.first_error(instance) is None:
+            return None
+        return load_jsonschema().exceptions.best_match(self.validator.iter_errors(instance))
+
+
+def _attach_fast(entry, fast_validator):
+    # Uses a generated validator only if it was built from the cached schema
+    if getattr(fast_validator, "SCHEMA_SHA256", None) == entry.sha256:
+        entry.fast = fast_validator
+
+
+class SchemaRegistry:
+    """
+    Process-wide cache of compiled schema validators.
+
+    Each schema file is read, parsed and checked against its meta-schema once.
+    Later lookups only stat the file; the schema is reloaded when its size or
+    modification time changes, and recompiled only if its contents hash differs.
+
+    When a generated validator built from the same file is given, the schema
+    is taken from the module's SCHEMA constant and not checked again, as
+    codegen checked it when generating the module; the jsonschema validator
+    is then only built when first needed. A matching generated validator
+    given later is attached to an entry cached without one, so the order in
+    which callers first look a schema up does not matter.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, schema_path, fast_validator=None):
+        """
+        Returns the CompiledSchema for a schema file, loading it if needed.
+
+        Args:
+            schema_path (str): Path to a JSON schema file.
+            fast_validator: Optional generated validator module. It is used
+                only if its SCHEMA_SHA256 matches the file being loaded.
+
+        Returns:
+            CompiledSchema: The cached compiled schema.
+
+        Raises:
+            FileNotFoundError: If the schema file does not exist.
+            json.JSONDecodeError: If the schema file is not valid JSON.
+            jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+            RuntimeError: If jsonschema is needed to compile the schema but
+                is not installed.
+        """
+        path = os.path.abspath(schema_path)
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry.stat_key == stat_key:
+            if entry.fast is None and fast_validator is not None:
+                _attach_fast(entry, fast_validator)
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stat_key == stat_key:
+                if entry.fast is None and fast_validator is not None:
+                    _attach_fast(entry, fast_validator)
+                return entry
+
+            with open(path, 'rb') as f:
+                raw = f.read()
+            sha256 = hashlib.sha256(raw).hexdigest()
+
+            if entry is not None and entry.sha256 == sha256:
+                # Touched but not changed: keep the compiled validator
+                entry.stat_key = stat_key
+                if entry.fast is None and fast_validator is not None:
+                    _attach_fast(entry, fast_validator)
+                return entry
+
+            if fast_validator is not None and getattr(fast_validator, "SCHEMA_SHA256", None) != sha256:
+                fast_validator = None
+            schema = getattr(fast_validator, "SCHEMA", None)
+            if schema is not None:
+                validator = None
+            else:
+                schema = json.loads(raw)
+                cls = load_jsonschema().validators.validator_for(schema)
+                cls.check_schema(schema)
+                validator = cls(schema)
+            entry = CompiledSchema(path, sha256, stat_key, schema, validator, fast_validator)
+            self._entries[path] = entry
+            return entry
+
+    def clear(self):
+        """Drops every cached schema."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by validate_vendor, validate_customer and the batch tools
+default_registry = SchemaRegistry()
+
+
+def get_compiled_schema(schema_path, fast_validator=None):
+    """
+    Returns the CompiledSchema for a schema file from the process-wide registry.
+
+    Args:
+        schema_path (str): Path to a JSON schema file.
+        fast_validator: Optional generated validator module for the schema.
+
+    Returns:
+        CompiledSchema: The cached compiled schema.
+    """
+    return default_registry.get(schema_path, fast_validator)
@@ -0,0 +1,444 @@
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from validation.bulk import get_record_validator
+
+RECORD_TYPES = ("vendor", "customer")
+
+# Upper bounds (milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = (0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class ServiceStopped(Exception):
+    """Raised for records still waiting when the service is stopped."""
+
+
+def _init_service_worker():
+    # Compile both schemas once per worker process
+    for record_type in RECORD_TYPES:
+        get_record_validator(record_type)({})
+
+
+def _warm_worker():
+    # No-op task; completing it means a worker has started and run its initializer
+    return None
+
+
+def _validate_batch(record_type, records):
+    validate = get_record_validator(record_type)
+    return [validate(record) for record in records]
+
+
+class ServiceMetrics:
+    """
+    Request counters and latency statistics for the validation service.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.monotonic()
+        self.requests = {t: 0 for t in RECORD_TYPES}
+        self.valid = {t: 0 for t in RECORD_TYPES}
+        self.invalid = {t: 0 for t in RECORD_TYPES}
+        self.rejected = 0
+        self.bad_requests = 0
+        self.errors = 0
+        self.pool_restarts = 0
+        self.batches = 0
+        self.batched_records = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._recent = deque(maxlen=window)
+
+    def observe(self, record_type, is_valid, seconds):
+        self.requests[record_type] += 1
+        if is_valid:
+            self.valid[record_type] += 1
+        else:
+            self.invalid[record_type] += 1
+        milliseconds = seconds * 1000
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self._recent.append((time.monotonic(), milliseconds))
+
+    def snapshot(self):
+        """Returns the current counters as a JSON-serializable dict."""
+        now = time.monotonic()
+        recent = sorted(ms for _, ms in self._recent)
+        last_second = sum(1 for t, _ in self._recent if now - t <= 1.0)
+        total = sum(self.requests.values())
+
+        def percentile(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else None
+
+        return {
+            "uptime_seconds": round(now - self.started, 3),
+            "requests": dict(self.requests),
+            "valid": dict(self.valid),
+            "invalid": dict(self.invalid),
+            "rejected": self.rejected,
+            "bad_requests": self.bad_requests,
+            "errors": self.errors,
+            "pool_restarts": self.pool_restarts,
+            "batches": self.batches,
+            "mean_batch_size": round(self.batched_records / self.batches, 2) if self.batches else None,
+            "requests_per_second": round(total / (now - self.started), 1) if now > self.started else None,
+            "requests_last_second": last_second,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "buckets": {
+                    **{f"le_{b}": n for b, n in zip(LATENCY_BUCKETS_MS, self.latency_buckets)},
+                    "le_inf": self.latency_buckets[-1],
+                },
+            },
+        }
+
+
+class ValidationService:
+    """
+    Validates records submitted concurrently, grouping them into micro-batches.
+
+    start() launches the worker processes and waits for them to be ready.
+    Each record type has a bounded queue. A batcher task takes the first
+    waiting record, gathers more for up to max_delay seconds or until
+    batch_size records are collected, and validates the batch either in the
+    event loop thread (workers=0) or on a process pool. When a queue is full,
+    submit raises asyncio.QueueFull so callers can shed load. If a worker
+    process dies, the records of the batches it broke fail with
+    BrokenProcessPool and the pool is replaced for later batches.
+
+    Args:
+        workers (int): Worker processes; 0 validates in the event loop thread.
+        batch_size (int): Maximum records per batch.
+        max_delay (float): Longest time, in seconds, to wait to fill a batch.
+        queue_size (int): Maximum records waiting per record type.
+    """
+
+    def __init__(self, workers=0, batch_size=64, max_delay=0.001, queue_size=1024):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.queue_size = queue_size
+        self.metrics = ServiceMetrics()
+        self._queues = {}
+        self._tasks = []
+        self._pool_tasks = set()
+        self._executor = None
+        self._in_flight = None
+
+    async def start(self):
+        for record_type in RECORD_TYPES:
+            get_record_validator(record_type)({})
+        if self.workers:
+            self._executor = self._new_executor()
+            self._in_flight = asyncio.Semaphore(self.workers * 2)
+            await self._warm_pool()
+        for record_type in RECORD_TYPES:
+            self._queues[record_type] = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks.append(asyncio.create_task(self._batcher(record_type)))
+
+    def _new_executor(self):
+        # Spawned rather than forked workers, so they do not inherit the
+        # sockets of connections open when a pool is started or replaced
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_service_worker,
+        )
+
+    async def _warm_pool(self):
+        # Pools start their workers on demand, so without this the first
+        # requests would wait for interpreters to spawn and compile the schemas
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _warm_worker) for _ in range(self.workers)
+        ))
+
+    async def stop(self):
+        """
+        Stops the batchers, waits for the batches already on the pool and
+        fails the records still queued with ServiceStopped.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*self._pool_tasks, return_exceptions=True)
+        for queue in self._queues.values():
+            while not queue.empty():
+                self._fail([queue.get_nowait()], ServiceStopped("Validation service stopped"))
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def submit(self, record_type, record):
+        """
+        Validates one record and returns (bool, str).
+
+        Raises:
+            asyncio.QueueFull: If the queue for the record type is full.
+            BrokenProcessPool: If a worker process died while validating
+                the record's batch.
+            ServiceStopped: If the service was stopped before the record
+                was validated.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues[record_type].put_nowait((record, future))
+        return await future
+
+    async def _batcher(self, record_type):
+        queue = self._queues[record_type]
+        while True:
+            batch = [await queue.get()]
+            try:
+                await self._gather_and_run(record_type, queue, batch)
+            except asyncio.CancelledError:
+                # Stopped while gathering or waiting for a pool slot
+                self._fail(batch, ServiceStopped("Validation service stopped"))
+                raise
+
+    async def _gather_and_run(self, record_type, queue, batch):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        self.metrics.batches += 1
+        self.metrics.batched_records += len(batch)
+        if self._executor is None:
+            try:
+                results = _validate_batch(record_type, [record for record, _ in batch])
+            except Exception as e:
+                # Fail this batch only; the batcher keeps serving the queue
+                self._fail(batch, e)
+            else:
+                self._resolve(batch, results)
+        else:
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._run_in_pool(record_type, batch))
+            self._pool_tasks.add(task)
+            task.add_done_callback(self._pool_tasks.discard)
+
+    async def _run_in_pool(self, record_type, batch):
+        executor = self._executor
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                executor, _validate_batch, record_type, [record for record, _ in batch]
+            )
+        except BrokenProcessPool as e:
+            # Every batch in flight on the broken pool lands here; replace it once
+            if self._executor is executor:
+                self.metrics.pool_restarts += 1
+                executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+            self._fail(batch, e)
+        except asyncio.CancelledError:
+            self._fail(batch, ServiceStopped("Validation service stopped"))
+            raise
+        except Exception as e:
+            self._fail(batch, e)
+        else:
+            self._resolve(batch, results)
+        finally:
+            self._in_flight.release()
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _resolve(batch, results):
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def _read_request(reader):
+    """
+    Reads one HTTP/1.1 request. Returns (method, path, headers, body), or
+    None when the client closed the connection.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ValueError("Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = b""
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > MAX_BODY_BYTES:
+            raise OverflowError
+        body = await reader.readexactly(length)
+    return method, path.split("?", 1)[0], headers, body
+
+
+def _response(status, payload, keep_alive, extra_headers=()):
+    body = json.dumps(payload).encode("utf-8")
+    lines = [
+        f"HTTP/1.1 {status} {_REASONS[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+        *extra_headers,
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def handle_connection(service, reader, writer):
+    """Serves HTTP requests on one client connection."""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except OverflowError:
+                writer.write(_response(413, {"error": "Request body too large"}, False))
+                break
+            except (ValueError, asyncio.IncompleteReadError):
+                service.metrics.bad_requests += 1
+                writer.write(_response(400, {"error": "Malformed HTTP request"}, False))
+                break
+            if request is None:
+                break
+
+            method, path, headers, body = request
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(await _dispatch(service, method, path, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _dispatch(service, method, path, body, keep_alive):
+    if path == "/metrics":
+        if method != "GET":
+            return _response(405, {"error": "Use GET"}, keep_alive)
+        return _response(200, service.metrics.snapshot(), keep_alive)
+
+    record_type = path[len("/validate/"):] if path.startswith("/validate/") else None
+    if record_type not in RECORD_TYPES:
+        return _response(404, {"error": "Use /validate/vendor, /validate/customer or /metrics"}, keep_alive)
+    if method != "POST":
+        return _response(405, {"error": "Use POST"}, keep_alive)
+
+    start = time.perf_counter()
+    try:
+        record = json.loads(body)
+    except ValueError as e:
+        # Also covers UnicodeDecodeError
+        service.metrics.bad_requests += 1
+        return _response(400, {"error": f"Invalid JSON: {e}"}, keep_alive)
+    except RecursionError:
+        service.metrics.bad_requests += 1
+        return _response(400, {"error": "Invalid JSON: nested too deeply"}, keep_alive)
+    try:
+        is_valid, message = await service.submit(record_type, record)
+    except asyncio.QueueFull:
+        service.metrics.rejected += 1
+        return _response(503, {"error": "Validation queue is full"}, keep_alive, ["Retry-After: 1"])
+    except ServiceStopped:
+        return _response(503, {"error": "Validation service is stopping"}, keep_alive)
+    except BrokenProcessPool:
+        service.metrics.errors += 1
+        return _response(500, {"error": "A validation worker stopped; retry the request"}, keep_alive)
+    except Exception as e:
+        service.metrics.errors += 1
+        return _response(500, {"error": f"Validation failed: {e}"}, keep_alive)
+    service.metrics.observe(record_type, is_valid, time.perf_counter() - start)
+    return _response(200, {"valid": is_valid, "message": message}, keep_alive)
+
+
+async def serve(host="127.0.0.1", port=8080, ready=None, **service_options):
+    """
+    Runs the validation service until cancelled.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on; 0 picks a free port.
+        ready (asyncio.Future): If given, set to the bound (host, port) once
+            the server accepts connections.
+        **service_options: Passed to ValidationService.
+    """
+    service = ValidationService(**service_options)
+    await service.start()
+    try:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_connection(service, reader, writer), host, port
+        )
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Validation service listening on http://{host}:{port}", file=sys.stderr)
+        if ready is not None:
+            ready.set_result((host, port))
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service validating vendor and customer records.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="Worker processes for validation (default: 0, validate in the server process)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Maximum records per micro-batch")
+    parser.add_argument("--max-delay-ms", type=float, default=1.0,
+                        help="Longest wait to fill a micro-batch, in milliseconds")
+    parser.add_argument("--queue-size", type=int, default=1024,
+                        help="Records waiting per endpoint before requests are rejected with 503")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(
+            args.host,
+            args.port,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            max_delay=args.max_delay_ms / 1000,
+            queue_size=args.queue_size,
+        ))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())